@@ -2,12 +2,11 @@
 import streamlit as st
 from packaging import version
 
-from pollination_streamlit_viewer import viewer
-
 from inputs import initialize
-from menu import study_menu
+from menu import study_menu, has_local_results
 from run import check_run_recipe
-from results import load_results, load_from_folder
+from results import load_results, load_local_results, load_from_folder
+from vis_set import request_vis_set, vis_set_tasks, show_vis_set, start_vis_set_run
 from process_results import (process_summary, show_errors, process_space,
     process_states_schedule, process_ase)
 from report import export_report
@@ -22,6 +21,7 @@ def main():
     """Main."""
     st.header('LEED Daylight Option I')
     initialize()
+    start_vis_set_run()
 
     study_tab, summary_tab, states_schedule_tab, dir_ill_tab, visualization_tab, report_tab = \
         st.tabs(['Select a study', 'Summary report', 'States schedule',
@@ -31,14 +31,21 @@ def main():
     with study_tab:
         api_client, user_api = study_menu()
 
+    local_method = st.session_state['load_method'] == 'Load local results'
+    with study_tab:
+        local_ready = local_method and has_local_results()
     if st.session_state['run'] is not None \
-        or st.session_state['load_method'] == 'Try the sample run':
+        or st.session_state['load_method'] == 'Try the sample run' \
+        or local_ready:
         if st.session_state['load_method'] == 'Try the sample run':
-            folder, vtjks_file, summary, summary_grid, states_schedule, \
+            results, vtjks_file, summary, summary_grid, states_schedule, \
                 states_schedule_err, hb_model = load_from_folder(st.session_state.sample_folder)
+        elif local_method:
+            results, vtjks_file, summary, summary_grid, states_schedule, \
+                states_schedule_err, hb_model = load_local_results()
         else:
             check_run_recipe(study_tab)
-            folder, vtjks_file, summary, summary_grid, states_schedule, \
+            results, vtjks_file, summary, summary_grid, states_schedule, \
                 states_schedule_err, hb_model = load_results()
 
         with study_tab:
@@ -53,22 +60,38 @@ def main():
             process_states_schedule(states_schedule)
 
         with dir_ill_tab:
-            process_ase(folder)
+            process_ase(results)
 
         with visualization_tab:
-            viewer(content=vtjks_file.read_bytes(), key='viz')
+            if vtjks_file.is_file():
+                show_vis_set(vtjks_file, key='viz')
+            else:
+                # the visualization set is created in the background
+                run_folder = results.folder.parent
+                task = vis_set_tasks().get(run_folder)
+                if task is not None and task.done() and task.exception() is not None:
+                    st.error(f'Failed to create the visualization: {task.exception()}')
+                    if st.button('Retry', key='retry_viz'):
+                        request_vis_set(run_folder)
+                        st.rerun()
+                else:
+                    request_vis_set(run_folder)
+                    st.info('The visualization is being prepared. Refresh to check if it is ready.')
+                    st.button('Refresh', key='refresh_viz')
 
         with report_tab:
-            if st.session_state['load_method'] == 'Try the sample run':
-                export_report(user_api)
-            elif version.parse(st.session_state.run.recipe.tag) > version.parse('0.0.28'):
+            if st.session_state['load_method'] in ('Try the sample run', 'Load local results'):
                 export_report(user_api)
             else:
-                st.error(
-                    'Only versions pollination/leed-daylight-option-one:0.0.28 '
-                    'are able to generate a PDF report. The version used in your '
-                    f'study is: {st.session_state.run.recipe.tag}.'
-                )
+                recipe_tag = st.session_state.run.recipe.tag
+                if version.parse(recipe_tag) > version.parse('0.0.28'):
+                    export_report(user_api)
+                else:
+                    st.error(
+                        'Only versions pollination/leed-daylight-option-one:0.0.28 '
+                        'are able to generate a PDF report. The version used in your '
+                        f'study is: {recipe_tag}.'
+                    )
     else:
         for tab in (summary_tab, states_schedule_tab, dir_ill_tab,
                     visualization_tab, report_tab):
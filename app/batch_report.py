@@ -0,0 +1,274 @@
+"""Create the PDF reports of many run folders from the command line.
+
+Example:
+    python batch_report.py data/run-1 data/run-2 --output-folder reports
+    python batch_report.py --manifest runs.txt --workers 4
+"""
+import argparse
+import hashlib
+import logging
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ReportResult(NamedTuple):
+    run_folder: Path
+    output_file: Path
+    seconds: float
+    error: Optional[str] = None
+    cancelled: bool = False
+    timings: Optional[Dict[str, float]] = None
+
+
+def default_workers() -> int:
+    """Default number of processes to create reports with."""
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def read_manifest(manifest_file: Path) -> List[Path]:
+    """Read the run folders of a manifest file.
+
+    The manifest is a text file with one run folder on each line. Empty lines
+    and lines that start with # are ignored. Relative paths are relative to
+    the manifest file.
+    """
+    run_folders = []
+    with open(manifest_file) as inf:
+        for line in inf:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            run_folders.append(manifest_file.parent.joinpath(line))
+    return run_folders
+
+
+def output_files(run_folders: List[Path], output_folder: Path = None) -> List[Path]:
+    """Get the report file of each run folder.
+
+    The reports are named after their run folder. Run folders that share a name
+    but have different parents get a short hash of their parent folder in the
+    name so their reports do not overwrite each other.
+
+    Args:
+        run_folders: The run folders. A run folder must not be listed twice.
+        output_folder: The folder to write the reports to. If None, the reports
+            are written to report.pdf in each run folder.
+    """
+    resolved = [run_folder.resolve() for run_folder in run_folders]
+    duplicates = {run_folder for run_folder in resolved if resolved.count(run_folder) > 1}
+    if duplicates:
+        raise ValueError(
+            'The run folders are listed more than once: '
+            f'{", ".join(str(run_folder) for run_folder in sorted(duplicates))}')
+    if output_folder is None:
+        return [run_folder.joinpath('report.pdf') for run_folder in run_folders]
+    names = [run_folder.name for run_folder in resolved]
+    files = []
+    for run_folder in resolved:
+        name = run_folder.name
+        if names.count(name) > 1:
+            parent = hashlib.sha256(str(run_folder.parent).encode('utf-8')).hexdigest()[:8]
+            name = f'{name}-{parent}'
+        files.append(output_folder.joinpath(f'{name}.pdf'))
+    return files
+
+
+def create_report(
+        run_folder: Path, output_file: Path, prepared_by: str, project: str = None,
+        create_stories: bool = False, progress_file: Path = None,
+        cancel_file: Path = None, section_workers: int = 1,
+        chunk_size: int = None, figure_workers: int = None) -> ReportResult:
+    """Create the report of a run folder.
+
+    Errors are returned as part of the result so a failed report does not stop
+    the reports of the other run folders.
+
+    Args:
+        run_folder: The run folder.
+        output_file: The PDF file to write.
+        prepared_by: The name of the person who prepared the report.
+        project: The project name. If None, the project of the run is used.
+        create_stories: Set to True to create the stories of the model.
+        progress_file: An optional JSON file to write the progress of the
+            report to.
+        cancel_file: An optional file that cancels the report once it exists.
+            It is only checked if a progress file is set. It is checked before
+            the report starts and at each progress step.
+        section_workers: Number of processes to create the level and room
+            sections of the report with.
+        chunk_size: Build the level and room sections in chunks of this many
+            sections to bound the memory of large reports. If None, the
+            report is built at once.
+        figure_workers: Number of processes to render the heatmaps of the
+            report with. Defaults to pdf.figures.default_workers().
+    """
+    # imported here so the worker processes import the report dependencies and
+    # not the main process
+    from pdf_report import create_pdf
+    from pdf.progress import FileProgress, ReportCancelled, ReportProgress
+    from run_metadata import read_run_metadata
+
+    if progress_file is not None:
+        progress = FileProgress(
+            progress_file, cancel_file or progress_file.with_suffix('.cancel')).progress
+    else:
+        progress = ReportProgress()
+    start = time.perf_counter()
+    try:
+        # mark the report as started and stop if it was cancelled while it was
+        # queued
+        progress('start')
+        if project is None:
+            metadata = read_run_metadata(run_folder)
+            project = metadata['project'] if metadata else run_folder.name
+        report_data = {'prepared_by': prepared_by, 'project': project}
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        create_pdf(output_file, run_folder, None, report_data, create_stories,
+                   progress=progress, section_workers=section_workers,
+                   chunk_size=chunk_size, figure_workers=figure_workers)
+    except ReportCancelled as error:
+        return ReportResult(
+            run_folder, output_file, time.perf_counter() - start, str(error),
+            cancelled=True, timings=progress.timings
+        )
+    except Exception:
+        return ReportResult(
+            run_folder, output_file, time.perf_counter() - start,
+            traceback.format_exc(), timings=progress.timings
+        )
+    return ReportResult(
+        run_folder, output_file, time.perf_counter() - start,
+        timings=progress.timings
+    )
+
+
+def create_reports(
+        run_folders: List[Path], output_folder: Path = None, prepared_by: str = '',
+        project: str = None, create_stories: bool = False,
+        workers: int = None, section_workers: int = 1,
+        chunk_size: int = None, figure_workers: int = None) -> List[ReportResult]:
+    """Create the reports of many run folders in a pool of processes.
+
+    Args:
+        run_folders: The run folders. The run folders must be complete, e.g.
+            downloaded by the app.
+        output_folder: The folder to write the reports to. Each report is named
+            after its run folder. See output_files. If None, the reports are
+            written to report.pdf in each run folder.
+        prepared_by: The name of the person who prepared the reports.
+        project: The project name of the reports. If None, the project of each
+            run is used.
+        create_stories: Set to True to create the stories of the models.
+        workers: Number of worker processes. Defaults to default_workers().
+        section_workers: Number of processes each report creates its level
+            and room sections with.
+        chunk_size: Build the level and room sections of each report in
+            chunks of this many sections. If None, each report is built at
+            once.
+        figure_workers: Number of processes each report renders its heatmaps
+            with.
+
+    Returns:
+        A list of results in the order the reports finished.
+    """
+    workers = workers or default_workers()
+    files = output_files(run_folders, output_folder)
+    results = []
+    # spawn a fresh interpreter for each worker to not share state between reports
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = {}
+        for run_folder, output_file in zip(run_folders, files):
+            future = executor.submit(
+                create_report, run_folder, output_file, prepared_by, project,
+                create_stories, section_workers=section_workers,
+                chunk_size=chunk_size, figure_workers=figure_workers
+            )
+            futures[future] = (run_folder, output_file)
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception:
+                # the worker process died, e.g. it ran out of memory
+                result = ReportResult(*futures[future], 0, traceback.format_exc())
+            if result.error:
+                LOGGER.error(
+                    'Failed to create the report of %s after %.2f s:\n%s',
+                    result.run_folder, result.seconds, result.error
+                )
+            else:
+                LOGGER.info(
+                    'Created %s in %.2f s: %s', result.output_file, result.seconds,
+                    ', '.join(f'{stage} {seconds:.2f} s' for stage, seconds in (result.timings or {}).items())
+                )
+            results.append(result)
+    return results
+
+
+def main(args: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Create the LEED Daylight Option I reports of run folders.')
+    parser.add_argument('run_folders', nargs='*', type=Path, help='Run folders.')
+    parser.add_argument(
+        '--manifest', type=Path,
+        help='A text file with one run folder on each line.')
+    parser.add_argument(
+        '--output-folder', type=Path,
+        help='Folder to write the reports to. Defaults to each run folder.')
+    parser.add_argument('--prepared-by', default='', help='Name of the preparer.')
+    parser.add_argument(
+        '--project', help='Project name. Defaults to the project of each run.')
+    parser.add_argument(
+        '--create-stories', action='store_true',
+        help='Create the stories of the models by floor height.')
+    parser.add_argument(
+        '--workers', type=int, default=default_workers(),
+        help='Number of worker processes.')
+    parser.add_argument(
+        '--section-workers', type=int, default=1,
+        help='Number of processes each report creates its sections with.')
+    parser.add_argument(
+        '--chunk-size', type=int,
+        help='Build the sections of each report in chunks of this many '
+        'sections to bound the memory of large reports.')
+    parser.add_argument(
+        '--figure-workers', type=int,
+        help='Number of processes each report renders its heatmaps with.')
+    options = parser.parse_args(args)
+
+    run_folders = list(options.run_folders)
+    if options.manifest:
+        run_folders.extend(read_manifest(options.manifest))
+    if not run_folders:
+        parser.error('No run folders. Pass run folders or a manifest.')
+    try:
+        output_files(run_folders, options.output_folder)
+    except ValueError as error:
+        parser.error(str(error))
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    start = time.perf_counter()
+    results = create_reports(
+        run_folders, options.output_folder, options.prepared_by, options.project,
+        options.create_stories, options.workers, options.section_workers,
+        options.chunk_size, options.figure_workers
+    )
+    failed = [result for result in results if result.error]
+    LOGGER.info(
+        'Created %d of %d reports in %.2f s.', len(results) - len(failed),
+        len(results), time.perf_counter() - start
+    )
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
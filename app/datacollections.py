@@ -0,0 +1,75 @@
+"""Memory-mapped access to the hourly data collections of each sensor grid."""
+from pathlib import Path
+
+import numpy as np
+
+from hourly_matrix import HOURS, HourlyMatrix, write_hourly_matrix, is_up_to_date
+from results_source import FolderResults
+
+
+def matrix_file(results: FolderResults, datacollections_folder: str) -> Path:
+    """Get the path to the matrix file of a data collections folder.
+
+    The matrix is written next to the folder, e.g. ase_percentage_above.npy for
+    the datacollections/ase_percentage_above folder.
+    """
+    folder = results.path(datacollections_folder)
+    return folder.parent.joinpath(f'{folder.name}.npy')
+
+
+def write_matrix(results: FolderResults, datacollections_folder: str) -> Path:
+    """Convert a folder of data collections to a memory-mappable float32 matrix.
+
+    The folder must have a grids_info.json file and a JSON data collection for
+    each sensor grid. The matrix has one row of 8760 values for each grid in
+    the order of grids_info.json and the sidecar index uses the full_id of the
+    grids as the row names.
+
+    Args:
+        results: The leed-summary results.
+        datacollections_folder: The path of the data collections folder in the
+            results, e.g. datacollections/ase_percentage_above.
+    """
+    grids_info_file = results.path(f'{datacollections_folder}/grids_info.json')
+    grids_info = results.read_json(f'{datacollections_folder}/grids_info.json')
+    return write_hourly_matrix(
+        matrix_file(results, datacollections_folder),
+        _rows(results, datacollections_folder, grids_info), len(grids_info),
+        dtype='float32', source=grids_info_file
+    )
+
+
+def _rows(results: FolderResults, datacollections_folder: str, grids_info: list):
+    """Yield the full_id, the header and the values of each grid in order."""
+    for grid_info in grids_info:
+        full_id = grid_info['full_id']
+        data_dict = results.read_json(f'{datacollections_folder}/{full_id}.json')
+        yield full_id, data_dict['header'], data_dict['values']
+
+
+def build_datacollections(results: FolderResults, datacollections_folder: str) -> HourlyMatrix:
+    """Read the data collections of a folder in memory without a matrix file."""
+    grids_info = results.read_json(f'{datacollections_folder}/grids_info.json')
+    names, headers, matrix = [], [], np.zeros((len(grids_info), HOURS), dtype='float32')
+    for i, (name, header, values) in enumerate(_rows(results, datacollections_folder, grids_info)):
+        names.append(name)
+        headers.append(header)
+        matrix[i] = values
+    return HourlyMatrix(matrix, names, headers)
+
+
+def read_datacollections(results: FolderResults, datacollections_folder: str) -> HourlyMatrix:
+    """Memory-map the data collections of a folder.
+
+    The matrix is created the first time the folder is read. If the matrix
+    cannot be written, e.g. the folder is read-only, the data collections are
+    read in memory.
+    """
+    _matrix_file = matrix_file(results, datacollections_folder)
+    grids_info_file = results.path(f'{datacollections_folder}/grids_info.json')
+    if not is_up_to_date(_matrix_file, grids_info_file):
+        try:
+            write_matrix(results, datacollections_folder)
+        except (OSError, ValueError):
+            return build_datacollections(results, datacollections_folder)
+    return HourlyMatrix.from_file(_matrix_file)
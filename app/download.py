@@ -1,45 +1,278 @@
 """Functions to download results."""
+import hashlib
+import logging
+import os
+import shutil
+import time
 import zipfile
 import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
 
-import streamlit as st
+from pollination_io.interactors import Run
 from honeybee.model import Model
-from honeybee_display.model import model_to_vis_set
-from ladybug_vtk.visualization_set import VisualizationSet as VTKVisualizationSet
 
 from vis_metadata import _leed_daylight_option_one_vis_metadata
+from states_schedule import write_offsets, write_matrix
+from datacollections import write_matrix as write_datacollections_matrix
+from run_metadata import fetch_run_metadata, write_run_metadata
+from weather import read_location, read_location_file, write_location_file
+from results_source import (
+    FolderResults, LEED_SUMMARY_FOLDER, LEED_SUMMARY_ZIP, results_source
+)
 
 
-def download_files() -> None:
-    """Download files from a run on Pollination. This function uses the run
-    saved in the sessions state."""
-    run = st.session_state.run
-    run_folder = st.session_state.run_folder
+LOGGER = logging.getLogger(__name__)
 
-    _, info = next(run.job.runs_dataframe.input_artifacts.iterrows())
-    model_dict = json.load(run.job.download_artifact(info.model))
-    hb_model = Model.from_dict(model_dict)
-    hb_model.to_hbjson(name='model', folder=run_folder)
+# the model, the leed-summary output and the weather file
+DOWNLOAD_WORKERS = 3
+WEATHER_FILE = 'weather.wea'
+# local results can only be loaded from this folder on the machine that runs
+# the app. Loading local results is disabled if the environment variable is
+# not set
+LOCAL_RESULTS_ROOT = os.environ.get('LOCAL_RESULTS_ROOT')
 
-    leed_summary_folder = run_folder.joinpath('leed-summary')
 
-    output = run.download_zipped_output('leed-summary')
-    with zipfile.ZipFile(output) as zip_folder:
-        zip_folder.extractall(leed_summary_folder)
+class _StageTimer:
+    """Record the duration of the download stages. The stages can run in
+    different threads."""
 
-    if not leed_summary_folder.joinpath('states_schedule_err.json').is_file():
-        json.dump({}, leed_summary_folder.joinpath('states_schedule_err.json'))
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    def __call__(self, stage: str, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        self.timings[stage] = time.perf_counter() - start
+        return result
+
+
+def _download_model(run: Run, artifact: str, run_folder: Path, timer: _StageTimer) -> Model:
+    model_data = timer('download model', run.job.download_artifact, artifact)
+    hb_model = timer('parse model', lambda: Model.from_dict(json.load(model_data)))
+    timer('write model', hb_model.to_hbjson, 'model', run_folder)
+    return hb_model
+
+
+def _download_weather(run: Run, artifact: str, run_folder: Path, timer: _StageTimer) -> dict:
+    weather_data = timer('download weather', run.job.download_artifact, artifact)
+    weather_file = run_folder.joinpath(WEATHER_FILE)
+    weather_file.write_bytes(weather_data.getbuffer())
+    return timer('read location', read_location, weather_file)
+
+
+def weather_location(run: Optional[Run], run_folder: Path, metadata: Dict[str, Any]) -> dict:
+    """Get the location of the weather file of a run.
+
+    The location is written to its own file when the run is downloaded. For
+    older run folders the location is read from the header of the weather file
+    and written to the location file then. The weather file is downloaded if
+    the run folder does not have it and a run is given.
+
+    The files of the manifest of a run folder are never rewritten, so a run
+    folder stays complete.
+    """
+    location = read_location_file(run_folder)
+    if location is not None:
+        return location
+    if 'location' in metadata:
+        # run folders that have the location in their metadata
+        return metadata['location']
+    weather_file = run_folder.joinpath(WEATHER_FILE)
+    if not weather_file.is_file() and run is not None:
+        weather_data = run.job.download_artifact(metadata['input_artifacts']['wea'])
+        weather_file.write_bytes(weather_data.getbuffer())
+    location = read_location(weather_file)
+    write_location_file(run_folder, location)
+    return location
+
+
+def _prepare_leed_summary(results: FolderResults) -> None:
+    """Add the derived files of the app to the leed-summary results.
+
+    The derived files are written to the leed-summary folder. The members of a
+    zip file that the derived files are made from are extracted on demand.
+    """
+    results.folder.mkdir(parents=True, exist_ok=True)
+    if not results.exists('states_schedule_err.json'):
+        with open(results.folder.joinpath('states_schedule_err.json'), 'w') as json_file:
+            json.dump({}, json_file)
+
+    # index the aperture groups so their schedules can be read one by one and
+    # convert the schedules to a compact binary matrix
+    states_schedule_file = results.path('states_schedule.json')
+    write_offsets(states_schedule_file)
+    try:
+        write_matrix(states_schedule_file)
+    except ValueError:
+        # the states are not integers; the JSON file is read using the offsets
+        pass
+
+    # convert the hourly percentage of floor area above the ASE threshold
+    write_datacollections_matrix(results, 'datacollections/ase_percentage_above')
 
-    results_folder = leed_summary_folder.joinpath('results')
     metric_info_dict = _leed_daylight_option_one_vis_metadata()
     for metric, data in metric_info_dict.items():
-        file_path = results_folder.joinpath(metric, 'vis_metadata.json')
+        file_path = results.folder.joinpath('results', metric, 'vis_metadata.json')
+        file_path.parent.mkdir(parents=True, exist_ok=True)
         with open(file_path, 'w') as file:
             json.dump(data, file, indent=4)
 
-    vis_set = model_to_vis_set(
-        hb_model, color_by=None, include_wireframe=True,
-        grid_data_path=str(results_folder), active_grid_data='da'
+
+def _download_leed_summary(
+        run: Run, run_folder: Path, timer: _StageTimer, extract: bool = False) -> None:
+    output = timer('download leed-summary', run.download_zipped_output, 'leed-summary')
+
+    def _write():
+        output.seek(0)
+        with open(run_folder.joinpath(LEED_SUMMARY_ZIP), 'wb') as zip_file:
+            shutil.copyfileobj(output, zip_file, 1024 ** 2)
+
+    def _extract():
+        with zipfile.ZipFile(output) as zip_folder:
+            zip_folder.extractall(run_folder.joinpath(LEED_SUMMARY_FOLDER))
+
+    if extract:
+        timer('extract leed-summary', _extract)
+    else:
+        timer('write leed-summary', _write)
+    results = results_source(run_folder)
+    timer('prepare leed-summary', _prepare_leed_summary, results)
+
+
+def download_files(
+        run: Run, run_folder: Path, extract: bool = False) -> Dict[str, float]:
+    """Download files from a run on Pollination.
+
+    The model, the leed-summary output and the weather file are downloaded at
+    the same time. Each artifact is processed in its own worker as soon as it
+    is downloaded. The visualization set is not part of the download. It is
+    only needed by the Visualization tab and it is created in the background.
+
+    The leed-summary output is kept as a zip file and its members are read
+    from the zip when they are needed. The metadata of the run and the
+    location of its weather file are written to run_metadata.json and
+    weather_location.json so they are not requested again.
+
+    Args:
+        run: The run to download.
+        run_folder: The folder to download the files to.
+        extract: Set to True to extract the leed-summary output to a folder
+            instead of keeping the zip file.
+
+    Returns:
+        A dictionary with the duration of each stage in seconds.
+    """
+    timer = _StageTimer()
+    start = time.perf_counter()
+
+    metadata = timer('fetch metadata', fetch_run_metadata, run)
+    artifacts = metadata['input_artifacts']
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        model_future = executor.submit(_download_model, run, artifacts['model'], run_folder, timer)
+        leed_summary_future = executor.submit(
+            _download_leed_summary, run, run_folder, timer, extract)
+        weather_future = executor.submit(_download_weather, run, artifacts['wea'], run_folder, timer)
+        model_future.result()
+        leed_summary_future.result()
+        location = weather_future.result()
+    write_run_metadata(run_folder, metadata)
+    write_location_file(run_folder, location)
+
+    timer.timings['total'] = time.perf_counter() - start
+    LOGGER.info(
+        'Downloaded %s in %.2f s: %s', run_folder.name, timer.timings['total'],
+        ', '.join(f'{stage} {seconds:.2f} s' for stage, seconds in timer.timings.items())
+    )
+    return timer.timings
+
+
+def local_results_root() -> Optional[Path]:
+    """Get the folder local results can be loaded from or None if loading
+    local results is disabled."""
+    if not LOCAL_RESULTS_ROOT:
+        return None
+    return Path(LOCAL_RESULTS_ROOT).resolve()
+
+
+def resolve_local_path(path: str) -> Path:
+    """Resolve the path to a local input.
+
+    A relative path is relative to the local results root. Symbolic links are
+    resolved before the path is checked so a link can not point outside of
+    the root.
+
+    Raises:
+        ValueError: If loading local results is disabled or if the path is
+            outside of the local results root.
+    """
+    root = local_results_root()
+    if root is None:
+        raise ValueError('Loading local results is disabled.')
+    local_path = root.joinpath(path).resolve()
+    if not local_path.is_relative_to(root):
+        raise ValueError(f'The path is outside of the local results folder: {path}')
+    return local_path
+
+
+def local_run_folder(data_folder: Path, results_path: Path, model_file: Path) -> Path:
+    """Get the run folder of local results.
+
+    The name of the folder is a hash of the paths, sizes and modification times
+    of the inputs so changed inputs are ingested to a new run folder.
+    """
+    digest = hashlib.sha256()
+    for input_path in (results_path, model_file):
+        input_path = input_path.resolve()
+        stat = input_path.stat()
+        digest.update(f'{input_path}:{stat.st_mtime_ns}:{stat.st_size};'.encode())
+    if results_path.is_dir():
+        # the modification time of a folder does not change when a file in it
+        # is rewritten
+        stat = results_path.joinpath('summary.json').stat()
+        digest.update(f'{stat.st_mtime_ns}:{stat.st_size}'.encode())
+    return data_folder.joinpath(f'local-{digest.hexdigest()[:16]}')
+
+
+def _copy_file(src: Path, dst: Path) -> None:
+    with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+        shutil.copyfileobj(src_file, dst_file, 1024 ** 2)
+
+
+def copy_local_files(results_path: Path, model_file: Path, run_folder: Path) \
+        -> Dict[str, float]:
+    """Copy local results to a run folder.
+
+    The local results go through the same pipeline as the results of a run on
+    Pollination. The files are copied in chunks so large inputs are never read
+    into memory as a whole. A leed-summary zip file is kept as a zip file.
+
+    Args:
+        results_path: A leed-summary zip file or an extracted leed-summary
+            folder.
+        model_file: The HBJSON file of the model.
+        run_folder: The folder to copy the files to.
+
+    Returns:
+        A dictionary with the duration of each stage in seconds.
+    """
+    timer = _StageTimer()
+    start = time.perf_counter()
+
+    timer('copy model', _copy_file, model_file, run_folder.joinpath('model.hbjson'))
+    if results_path.is_dir():
+        timer('copy leed-summary', shutil.copytree, results_path,
+              run_folder.joinpath(LEED_SUMMARY_FOLDER))
+    else:
+        timer('copy leed-summary', _copy_file, results_path,
+              run_folder.joinpath(LEED_SUMMARY_ZIP))
+    results = results_source(run_folder)
+    timer('prepare leed-summary', _prepare_leed_summary, results)
+
+    timer.timings['total'] = time.perf_counter() - start
+    LOGGER.info(
+        'Copied %s in %.2f s: %s', results_path, timer.timings['total'],
+        ', '.join(f'{stage} {seconds:.2f} s' for stage, seconds in timer.timings.items())
     )
-    vtk_vs = VTKVisualizationSet.from_visualization_set(vis_set)
-    vtk_vs.to_vtkjs(folder=run_folder, name='vis_set')
+    return timer.timings
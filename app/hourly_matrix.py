@@ -0,0 +1,144 @@
+"""Memory-mapped matrices of annual hourly values.
+
+A matrix is stored as a NumPy ``.npy`` file with one row of 8760 values for each
+data collection and a JSON sidecar index with the name and the header of each
+row. The header of a row is stored without its values so the sidecar stays small.
+"""
+import json
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from ladybug.datacollection import HourlyContinuousCollection
+from ladybug.header import Header
+
+
+HOURS = 8760
+
+
+def index_file(matrix_file: Path) -> Path:
+    """Get the path to the sidecar index of a matrix file."""
+    return matrix_file.parent.joinpath(f'{matrix_file.stem}_index.json')
+
+
+def source_signature(source: Path) -> dict:
+    """Get the size and modification time of the source of a matrix."""
+    stat = source.stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def write_hourly_matrix(
+        matrix_file: Path, rows: Iterable[Tuple[str, dict, list]], count: int,
+        dtype: str, source: Path = None) -> Path:
+    """Write rows of hourly values to a memory-mappable matrix file.
+
+    The rows are written one at a time so the values are never loaded in memory
+    as a whole.
+
+    Args:
+        matrix_file: Path to the output .npy file.
+        rows: An iterable of (name, header dictionary, values) for each row.
+        count: Number of rows.
+        dtype: NumPy data type of the matrix. The values of each row are
+            checked to fit in this data type without loss.
+        source: Optional path to the file the matrix is created from. It is
+            used to check if the matrix is up to date with its source.
+
+    Returns:
+        Path to the matrix file.
+    """
+    temp_file = matrix_file.with_suffix('.tmp.npy')
+    matrix = np.lib.format.open_memmap(
+        temp_file, mode='w+', dtype=dtype, shape=(count, HOURS))
+    names, headers = [], []
+    try:
+        for i, (name, header, values) in enumerate(rows):
+            values = np.asarray(values)
+            row = values.astype(dtype)
+            if np.issubdtype(matrix.dtype, np.integer) and \
+                    not np.array_equal(row, values):
+                raise ValueError(
+                    f'The values of {name} cannot be stored as {dtype}.')
+            matrix[i] = row
+            names.append(name)
+            headers.append(header)
+        matrix.flush()
+    except Exception:
+        del matrix
+        temp_file.unlink()
+        raise
+    del matrix
+    temp_file.replace(matrix_file)
+
+    index = {'names': names, 'headers': headers}
+    if source is not None:
+        index['source'] = source_signature(source)
+    with open(index_file(matrix_file), 'w') as outf:
+        json.dump(index, outf)
+
+    return matrix_file
+
+
+def is_up_to_date(matrix_file: Path, source: Path) -> bool:
+    """Check if a matrix file exists and is created from the current source."""
+    _index_file = index_file(matrix_file)
+    if not matrix_file.is_file() or not _index_file.is_file():
+        return False
+    with open(_index_file) as inf:
+        index = json.load(inf)
+    return index.get('source') == source_signature(source)
+
+
+class HourlyMatrix(Mapping):
+    """Read-only mapping of row names to hourly data collection dictionaries.
+
+    The matrix is memory-mapped. Only the rows that are requested are read from
+    disk.
+
+    Args:
+        matrix: A 2D array with one row of hourly values for each name.
+        names: A list of names for the rows.
+        headers: A list of ladybug Header dictionaries for the rows.
+    """
+
+    def __init__(self, matrix: np.ndarray, names: List[str], headers: List[dict]):
+        self.matrix = matrix
+        self.names = names
+        self.headers = headers
+        self._rows = {name: i for i, name in enumerate(names)}
+
+    @classmethod
+    def from_file(cls, matrix_file: Path) -> 'HourlyMatrix':
+        """Memory-map a matrix file and read its sidecar index."""
+        with open(index_file(matrix_file)) as inf:
+            index = json.load(inf)
+        matrix = np.load(matrix_file, mmap_mode='r')
+        return cls(matrix, index['names'], index['headers'])
+
+    def __getitem__(self, name: str) -> dict:
+        return self.datacollection(name).to_dict()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._rows
+
+    def array(self, name: str) -> np.ndarray:
+        """Get the hourly values of a row as a read-only array."""
+        return self.matrix[self._rows[name]]
+
+    def header(self, name: str) -> dict:
+        """Get the header dictionary of a row."""
+        return self.headers[self._rows[name]]
+
+    def datacollection(self, name: str) -> HourlyContinuousCollection:
+        """Get a row as a data collection."""
+        header = Header.from_dict(self.header(name))
+        values = self.array(name).astype(np.float64).tolist()
+        return HourlyContinuousCollection(header, values)
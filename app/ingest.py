@@ -0,0 +1,186 @@
+"""Download runs into complete run folders."""
+import hashlib
+import json
+import logging
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+
+LOGGER = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def _sha256(file_path: Path, chunk_size: int = 1024 ** 2) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_manifest(folder: Path) -> Path:
+    """Write a manifest with the size and checksum of every file in a folder.
+
+    The manifest is the marker of a complete run folder. It is written last.
+    """
+    files = {}
+    for file_path in sorted(folder.rglob('*')):
+        if not file_path.is_file() or file_path.name == MANIFEST_FILE:
+            continue
+        files[file_path.relative_to(folder).as_posix()] = {
+            'size': file_path.stat().st_size,
+            'sha256': _sha256(file_path)
+        }
+    manifest_file = folder.joinpath(MANIFEST_FILE)
+    temp_file = manifest_file.with_suffix('.tmp')
+    with open(temp_file, 'w') as json_file:
+        json.dump({'files': files}, json_file)
+    temp_file.replace(manifest_file)
+    return manifest_file
+
+
+def is_complete(folder: Path, checksums: bool = False) -> bool:
+    """Check if a run folder has all the files of its manifest.
+
+    Args:
+        folder: A run folder.
+        checksums: Set to True to also compare the checksums of the files. By
+            default only the sizes are compared.
+    """
+    try:
+        with open(folder.joinpath(MANIFEST_FILE)) as json_file:
+            files = json.load(json_file)['files']
+    except (OSError, ValueError, KeyError):
+        return False
+    for relative_path, info in files.items():
+        file_path = folder.joinpath(relative_path)
+        try:
+            if file_path.stat().st_size != info['size']:
+                return False
+        except OSError:
+            return False
+        if checksums and _sha256(file_path) != info['sha256']:
+            return False
+    return True
+
+
+class RunLock:
+    """A lock of a run folder that is shared by all the processes of a machine.
+
+    The app server runs several processes and batch_report.py runs in its own
+    process, so the lock is a lock on a file next to the run folder and not a
+    lock in memory. Each use of the lock opens the file again so the threads
+    of a process also wait for each other.
+    """
+
+    def __init__(self, run_folder: Path):
+        self.lock_file = run_folder.parent.joinpath(f'.{run_folder.name}.lock')
+        self._file = None
+
+    def _lock(self, blocking: bool) -> bool:
+        if fcntl is not None:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(self._file, flags)
+            except BlockingIOError:
+                return False
+            return True
+        while True:
+            try:
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                if not blocking:
+                    return False
+                time.sleep(0.1)
+
+    def _unlock(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+        else:
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def acquire(self, blocking: bool = True) -> bool:
+        self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.lock_file, 'a')
+        if self._lock(blocking):
+            return True
+        self._file.close()
+        self._file = None
+        return False
+
+    def release(self) -> None:
+        self._unlock()
+        self._file.close()
+        self._file = None
+
+    def locked(self) -> bool:
+        """Check if another thread or process holds the lock."""
+        if not self.acquire(blocking=False):
+            return True
+        self.release()
+        return False
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+
+def is_ingesting(run_folder: Path) -> bool:
+    """Check if a run folder is being downloaded."""
+    return RunLock(run_folder).locked()
+
+
+def ingest_run(run_folder: Path, download: Callable[[Path], object]) -> bool:
+    """Make sure a run folder is complete and download it if it is not.
+
+    The files are downloaded to a staging folder next to the run folder. The
+    staging folder becomes the run folder once the download finished and the
+    manifest is written, so an interrupted download never leaves a run folder
+    that looks complete. An incomplete run folder is downloaded again.
+
+    Sessions and processes that open the same run wait for the one that
+    downloads it.
+
+    Args:
+        run_folder: The run folder.
+        download: A function that downloads the files of the run to the folder
+            it gets as argument.
+
+    Returns:
+        True if the run was downloaded and False if the run folder was already
+        complete.
+    """
+    if is_complete(run_folder):
+        return False
+    with RunLock(run_folder):
+        # another session may have downloaded the run while this one waited
+        if is_complete(run_folder):
+            return False
+        run_folder.parent.mkdir(parents=True, exist_ok=True)
+        staging_folder = Path(tempfile.mkdtemp(
+            dir=run_folder.parent, prefix=f'.{run_folder.name}-staging-'))
+        try:
+            download(staging_folder)
+            write_manifest(staging_folder)
+            if run_folder.exists():
+                LOGGER.info('Replacing incomplete run folder %s.', run_folder)
+                shutil.rmtree(run_folder)
+            staging_folder.replace(run_folder)
+        finally:
+            shutil.rmtree(staging_folder, ignore_errors=True)
+    return True
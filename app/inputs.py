@@ -2,6 +2,8 @@
 from pathlib import Path
 import streamlit as st
 
+from download import local_results_root
+
 
 def initialize():
     """Initialize the session state variables."""
@@ -22,9 +24,10 @@ def initialize():
     if 'active_option' not in st.session_state:
         st.session_state.active_option = 'Load from a project'
     if 'options' not in st.session_state:
-        st.session_state.options = [
-            'Load from a project', 'Try the sample run'
-        ]
+        st.session_state.options = ['Load from a project', 'Try the sample run']
+        # local results can only be loaded if the app is set up for it
+        if local_results_root() is not None:
+            st.session_state.options.append('Load local results')
     query_params = st.query_params
     if 'load_method' not in st.session_state:
         if 'url' in query_params:
@@ -40,5 +43,11 @@ def initialize():
         st.session_state.study_id = None
     if 'run_id' not in st.session_state:
         st.session_state.run_id = None
+    if 'local_results' not in st.session_state:
+        st.session_state.local_results = ''
+    if 'local_model' not in st.session_state:
+        st.session_state.local_model = ''
+    if 'report_job' not in st.session_state:
+        st.session_state.report_job = None
     if 'run_folder' not in st.session_state:
         st.session_state.run_folder = None
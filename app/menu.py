@@ -1,4 +1,5 @@
 """Functions to download results."""
+import zipfile
 import streamlit as st
 
 #from pollination_streamlit.interactors import Run
@@ -9,6 +10,10 @@ from pollination_streamlit_io import (auth_user, select_account, select_project,
 from pollination_io.api.user import UserApi
 from pollination_io.interactors import Run
 
+from download import local_results_root, resolve_local_path
+from run_cache import run_cache
+from run_metadata import session_cache
+
 
 def select_load_method():
     """Select how to load the results."""
@@ -24,7 +29,7 @@ def select_menu(api_client: ApiClient, user_api: UserApi):
     col_1, col_2 = st.columns(2)
     col_3, col_4 = st.columns(2)
     if user_api.client.is_authenticated:
-        user = user_api.get_user()
+        user = session_cache('user', user_api.get_user)
         username = user['username']
         with col_1:
             account = select_account(
@@ -84,6 +89,54 @@ def select_menu(api_client: ApiClient, user_api: UserApi):
                         st.session_state.run = None
 
 
+def local_results_menu():
+    """Select a local leed-summary output and the model of the study."""
+    col_1, col_2 = st.columns(2)
+    with col_1:
+        st.text_input(
+            'Results', key='local_results',
+            help='Path to a leed-summary zip file or an extracted leed-summary '
+            f'folder in {local_results_root()} on the machine that runs the app.'
+        )
+    with col_2:
+        st.text_input(
+            'Model', key='local_model',
+            help=f'Path to the HBJSON file of the model in {local_results_root()} '
+            'on the machine that runs the app.'
+        )
+
+
+def has_local_results() -> bool:
+    """Check if the selected local results can be loaded."""
+    if not st.session_state.local_results or not st.session_state.local_model:
+        return False
+    try:
+        results_path = resolve_local_path(st.session_state.local_results)
+        model_file = resolve_local_path(st.session_state.local_model)
+    except ValueError as error:
+        st.error(str(error))
+        return False
+    if not model_file.is_file():
+        st.error(f'The model file does not exist: {model_file}')
+        return False
+    if results_path.is_dir():
+        if not results_path.joinpath('summary.json').is_file():
+            st.error(f'The results folder has no summary.json file: {results_path}')
+            return False
+    elif zipfile.is_zipfile(results_path):
+        with zipfile.ZipFile(results_path) as zip_folder:
+            if 'summary.json' not in zip_folder.namelist():
+                st.error(
+                    'The results zip file must have the files of the '
+                    f'leed-summary folder at its root: {results_path}'
+                )
+                return False
+    else:
+        st.error(f'The results must be a zip file or a folder: {results_path}')
+        return False
+    return True
+
+
 def get_run(api_client: ApiClient, user_api: UserApi):
     """Get run."""
     if st.session_state['load_method'] == 'Load from a project':
@@ -94,6 +147,24 @@ def get_run(api_client: ApiClient, user_api: UserApi):
             help='Paste run URL.'
         )
         st.session_state['run'] = run
+    elif st.session_state['load_method'] == 'Load local results':
+        st.session_state['run'] = None
+        local_results_menu()
+
+
+def run_cache_status():
+    """Show the disk usage and hit rate of the downloaded runs."""
+    usage = run_cache().usage()
+    with st.expander('Run cache'):
+        st.progress(
+            min(usage.size / usage.max_bytes, 1.0),
+            text=f'{usage.size / 1024 ** 3:.2f} of {usage.max_bytes / 1024 ** 3:.2f} GB '
+            f'used by {usage.runs} runs'
+        )
+        st.caption(
+            f'Hit rate: {usage.hit_rate:.0%} ({usage.hits} of '
+            f'{usage.hits + usage.misses} runs loaded without a download)'
+        )
 
 
 def study_menu():
@@ -102,4 +173,5 @@ def study_menu():
     api_client = get_api_client()
     user_api = UserApi(api_client)
     get_run(api_client, user_api)
+    run_cache_status()
     return api_client, user_api
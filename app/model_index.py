@@ -0,0 +1,85 @@
+"""Lookup tables between the rooms, sensor grids and apertures of a model."""
+from typing import Dict, List
+
+from honeybee.model import Model, Room
+from honeybee.aperture import Aperture
+from honeybee_radiance.sensorgrid import SensorGrid
+
+
+class ModelIndex:
+    """Index of a Honeybee model for the lookups of the report.
+
+    The index is built in one pass over the model so each lookup is a
+    dictionary access instead of a scan of the rooms or sensor grids. The
+    lists keep the order of the model.
+
+    Args:
+        model: A Honeybee model.
+        grids_info: Optional content of a grids_info.json file.
+    """
+
+    def __init__(self, model: Model, grids_info: list = None):
+        self.rooms: Dict[str, Room] = {room.identifier: room for room in model.rooms}
+        self.sensor_grids: Dict[str, SensorGrid] = {}
+        self._room_by_grid: Dict[str, Room] = {}
+        self._grids_by_room: Dict[str, List[SensorGrid]] = {}
+        for sensor_grid in model.properties.radiance.sensor_grids:
+            full_id = sensor_grid.full_identifier
+            self.sensor_grids[full_id] = sensor_grid
+            room = self.rooms.get(sensor_grid.room_identifier)
+            if room is None:
+                continue
+            self._room_by_grid[full_id] = room
+            self._grids_by_room.setdefault(room.identifier, []).append(sensor_grid)
+
+        self._rooms_by_story: Dict[str, List[Room]] = {
+            story_id: [] for story_id in sorted(model.stories)}
+        for room in model.rooms:
+            if room.story in self._rooms_by_story:
+                self._rooms_by_story[room.story].append(room)
+
+        self._apertures_by_group: Dict[str, List[Aperture]] = {}
+        self._apertures_by_room_group: Dict[tuple, List[Aperture]] = {}
+        for room in model.rooms:
+            for aperture in room.apertures:
+                group = aperture.properties.radiance.dynamic_group_identifier
+                if group is None:
+                    continue
+                self._apertures_by_group.setdefault(group, []).append(aperture)
+                self._apertures_by_room_group.setdefault(
+                    (room.identifier, group), []).append(aperture)
+
+        self._grid_info: Dict[str, dict] = {
+            grid_info['full_id']: grid_info for grid_info in grids_info or []}
+
+    @property
+    def rooms_by_story(self) -> Dict[str, List[Room]]:
+        """The rooms of each story sorted by story identifier.
+
+        Rooms without a story are not included.
+        """
+        return self._rooms_by_story
+
+    def grids(self, room_identifier: str) -> List[SensorGrid]:
+        """Get the sensor grids of a room."""
+        return self._grids_by_room.get(room_identifier, [])
+
+    def room(self, grid_full_id: str) -> Room:
+        """Get the room of a sensor grid."""
+        return self._room_by_grid[grid_full_id]
+
+    def apertures(self, aperture_group: str, room_identifier: str = None) -> List[Aperture]:
+        """Get the apertures of an aperture group.
+
+        Args:
+            aperture_group: The dynamic group identifier of the apertures.
+            room_identifier: An optional room identifier to only get the
+                apertures of the group in this room.
+        """
+        if room_identifier is None:
+            return self._apertures_by_group.get(aperture_group, [])
+        return self._apertures_by_room_group.get((room_identifier, aperture_group), [])
+
+    def grid_info(self, grid_full_id: str) -> dict:
+        """Get the grids_info.json entry of a sensor grid."""
+        return self._grid_info[grid_full_id]
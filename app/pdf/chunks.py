@@ -0,0 +1,142 @@
+from pathlib import Path
+from typing import List, NamedTuple, Tuple
+
+from pdfrw import PdfReader, PdfWriter, PageMerge, PdfDict, PdfName, PdfArray, PdfString
+from reportlab.platypus.tableofcontents import TableOfContents
+
+from pdf.template import page_number_overlay
+
+
+class TocEntry(NamedTuple):
+    """An entry of the table of contents. Like the entries of MyDocTemplate,
+    the page is counted after the skip pages of the document."""
+    level: int
+    text: str
+    page: int
+
+
+class ChunkedTableOfContents(TableOfContents):
+    """A table of contents that also lists the entries of the chunks of a
+    document that are built separately.
+
+    The entries of the flowables of the document come first followed by the
+    extra entries.
+    """
+
+    def __init__(self, **kwds):
+        super().__init__(**kwds)
+        self.extra_entries: List[TocEntry] = []
+
+    def _extra_entries(self) -> list:
+        return [(level, text, page, None) for level, text, page in self.extra_entries]
+
+    def beforeBuild(self):
+        super().beforeBuild()
+        self._lastEntries = self._lastEntries + self._extra_entries()
+
+    def isSatisfied(self):
+        return self._entries + self._extra_entries() == self._lastEntries
+
+    def entries(self) -> List[TocEntry]:
+        """The entries of the flowables of the document in the last build."""
+        return [TocEntry(*entry[:3]) for entry in self._entries]
+
+
+def record_toc_entries(doc) -> List[TocEntry]:
+    """Record the TOCEntry notifications of a document during its build.
+
+    The page of each entry is relative to the skip pages of the document.
+    """
+    entries = []
+    notify = doc.notify
+
+    def _notify(kind, stuff):
+        if kind == 'TOCEntry':
+            entries.append(TocEntry(*stuff[:3]))
+        notify(kind, stuff)
+
+    doc.notify = _notify
+    return entries
+
+
+def page_count(pdf_file: Path) -> int:
+    """The number of pages of a PDF file."""
+    return len(PdfReader(str(pdf_file)).pages)
+
+
+def _outlines(entries: List[Tuple[int, str, int]], pages: PdfArray) -> PdfDict:
+    """Create the bookmarks of a document from (level, text, page index)."""
+    root = PdfDict(Type=PdfName.Outlines)
+    parents = [root]
+    for level, text, page_index in entries:
+        # a level 2 entry without a level 1 entry is added to the root
+        level = min(level, len(parents) - 1)
+        parent = parents[level]
+        item = PdfDict(
+            Title=PdfString.encode(text), Parent=parent,
+            Dest=PdfArray([pages[page_index], PdfName.Fit])
+        )
+        item.indirect = True
+        if parent.Last is None:
+            parent.First = item
+        else:
+            parent.Last.Next = item
+            item.Prev = parent.Last
+        parent.Last = item
+        if parent is not root:
+            # the bookmarks are open
+            parent.Count = (parent.Count or 0) + 1
+        del parents[level + 1:]
+        parents.append(item)
+    root.Count = len(entries)
+    return root
+
+
+def merge_chunks(
+        chunk_files: List[Path], output_file: Path, entries: List[TocEntry],
+        pagesize: tuple, skip_pages: int = 0, start_on_skip_pages: bool = None,
+        title: str = None) -> int:
+    """Merge the PDF files of the chunks of a document.
+
+    The page numbers are added to the merged pages and the entries of the
+    table of contents are added as bookmarks.
+
+    Args:
+        chunk_files: The PDF files of the chunks in the order of the document.
+            The chunks are built without page numbers.
+        output_file: The PDF file to write.
+        entries: The entries of the table of contents of the document.
+        pagesize: The page size of the document.
+        skip_pages: The number of pages without a page number at the start of
+            the document.
+        start_on_skip_pages: Set to True to start counting the pages after the
+            skip pages.
+        title: An optional title of the document.
+
+    Returns:
+        The number of pages of the document.
+    """
+    pages = []
+    for chunk_file in chunk_files:
+        pages.extend(PdfReader(str(chunk_file)).pages)
+    numbers = PdfReader(
+        page_number_overlay(len(pages), pagesize, skip_pages, start_on_skip_pages)).pages
+    writer = PdfWriter()
+    for page_number, (page, number_page) in enumerate(zip(pages, numbers), start=1):
+        if page_number > skip_pages:
+            PageMerge(page).add(number_page).render()
+        writer.addpage(page)
+
+    # the pages of the entries are counted after the skip pages
+    offset = skip_pages - 1
+    trailer = writer.trailer
+    if entries:
+        trailer.Root.Outlines = _outlines(
+            [(level, text, page + offset) for level, text, page in entries],
+            writer.pagearray
+        )
+        trailer.Root.PageMode = PdfName.UseOutlines
+    if title:
+        trailer.Info = PdfDict(Title=PdfString.encode(title))
+    writer.write(str(output_file), trailer=trailer)
+    return len(pages)
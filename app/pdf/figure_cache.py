@@ -0,0 +1,100 @@
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+# the folder is hidden so the run cache does not take it for a run folder
+DEFAULT_CACHE_FOLDER = Path(__file__).parents[1].joinpath('data', '.figure-cache')
+DEFAULT_MAX_BYTES = 512 * 1024 ** 2
+
+
+class FigureCache:
+    """Content-addressed disk cache of rendered figures.
+
+    A rendered figure is stored under the hash of its values and its render
+    settings, so identical figures are only rendered once, across reports,
+    sessions and processes. The least recently used figures are removed once
+    the cache grows over its size limit.
+
+    Args:
+        folder: Folder to store the rendered figures in.
+        max_bytes: Size limit of the cache in bytes.
+    """
+
+    def __init__(self, folder: Path = DEFAULT_CACHE_FOLDER, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.folder = Path(folder)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(values: bytes, *settings, format: str = 'pdf') -> str:
+        """Get the cache key of a figure.
+
+        Args:
+            values: The values of the figure.
+            settings: Everything else that changes the rendered figure, e.g.
+                the title and the size.
+            format: The format of the rendered figure.
+        """
+        digest = hashlib.sha256(values)
+        digest.update(repr(settings).encode('utf-8'))
+        return f'{digest.hexdigest()}.{format}'
+
+    def _path(self, key: str) -> Path:
+        # two-character sub folders to keep the folders small
+        return self.folder.joinpath(key[:2], key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a rendered figure. Returns None if the figure is not cached."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        # update the modification time that is used for the eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Add a rendered figure to the cache."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        temp_path.write_bytes(data)
+        temp_path.replace(path)
+
+    def _files(self) -> List[Tuple[float, int, Path]]:
+        files = []
+        for path in self.folder.glob('*/*'):
+            # the files that are being written by another process
+            if path.suffix == '.tmp':
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def size(self) -> int:
+        """Total size of the cached figures in bytes."""
+        return sum(size for _, size, _ in self._files())
+
+    def evict(self) -> None:
+        """Remove the least recently used figures until the cache fits its size limit."""
+        with self._lock:
+            files = self._files()
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files, key=lambda f: f[0]):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
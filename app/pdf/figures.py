@@ -0,0 +1,151 @@
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Dict, Hashable, NamedTuple, Optional, Tuple
+
+import numpy as np
+from reportlab.graphics import renderPDF
+
+from pdf.figure_cache import FigureCache
+from pdf.flowables import PdfImage, grid_heatmap, aperture_group_heatmap
+
+
+LOGGER = logging.getLogger(__name__)
+
+# change the version when the drawing of the heatmaps changes so the heatmaps in
+# the figure cache are rendered again
+RENDER_VERSION = 1
+
+
+class Heatmap(NamedTuple):
+    """An annual heatmap of a report.
+
+    Args:
+        kind: grid for the hours a sensor grid fails the 2% rule and
+            aperture_group for the shading schedule of an aperture group.
+        title: The sensor grid or the aperture group.
+        values: The failing hours of the year of a sensor grid or the 8760
+            values of a shading schedule.
+        shd_trans: The shade transmittance of an aperture group.
+    """
+    kind: str
+    title: str
+    values: np.ndarray
+    shd_trans: Optional[float] = None
+
+
+def default_workers() -> int:
+    """Default number of processes to render figures with."""
+    return max(1, min(4, (os.cpu_count() or 1) - 1))
+
+
+def _render_heatmap(heatmap: Heatmap, width: float) -> Tuple[bytes, float]:
+    """Render a heatmap to PDF bytes and return the bytes and the elapsed time."""
+    start = time.perf_counter()
+    if heatmap.kind == 'grid':
+        drawing = grid_heatmap(heatmap.title, heatmap.values, width)
+    else:
+        drawing = aperture_group_heatmap(
+            heatmap.title, heatmap.values, heatmap.shd_trans, width)
+    return renderPDF.drawToString(drawing), time.perf_counter() - start
+
+
+def _cache_key(heatmap: Heatmap, width: float) -> str:
+    values = np.ascontiguousarray(heatmap.values, dtype=float).tobytes()
+    return FigureCache.key(
+        values, RENDER_VERSION, heatmap.kind, heatmap.title, heatmap.shd_trans, width)
+
+
+def render_heatmaps(
+        heatmaps: Dict[Hashable, Heatmap], width: float, workers: int = None,
+        progress=None, cache: FigureCache = None
+    ) -> Tuple[Dict[Hashable, bytes], Dict[Hashable, float]]:
+    """Render the heatmaps of a report to PDF concurrently.
+
+    A heatmap is drawn once here instead of in every pass of the build of the
+    report. The report embeds the rendered page with heatmap_image. Identical
+    heatmaps are only rendered once.
+
+    Args:
+        heatmaps: A dictionary of heatmaps to render. The keys are used to look
+            up the rendered heatmaps.
+        width: Width of the heatmaps.
+        workers: Number of worker processes. If 1, the heatmaps are rendered in
+            the current process. Defaults to default_workers().
+        progress: An optional ReportProgress.
+        cache: An optional FigureCache. Heatmaps found in the cache are not
+            rendered again and rendered heatmaps are added to it.
+
+    Returns:
+        A tuple with a dictionary of the PDF bytes and a dictionary of the time
+        it took to render each heatmap in seconds. The time is 0 for the
+        heatmaps that are read from the cache or that are identical to another
+        heatmap.
+    """
+    workers = workers or default_workers()
+    images, timings = {}, {}
+    if not heatmaps:
+        return images, timings
+
+    start = time.perf_counter()
+    cache_keys = {key: _cache_key(heatmap, width) for key, heatmap in heatmaps.items()}
+    rendered, to_render = {}, {}
+    for key, heatmap in heatmaps.items():
+        cache_key = cache_keys[key]
+        if cache_key in rendered or cache_key in to_render:
+            continue
+        image = cache.get(cache_key) if cache is not None else None
+        if image is not None:
+            rendered[cache_key] = image
+        else:
+            to_render[cache_key] = (key, heatmap)
+
+    render_timings = {}
+    if workers == 1 or len(to_render) <= 1:
+        for count, (cache_key, (_, heatmap)) in enumerate(to_render.items()):
+            if progress is not None:
+                progress('render figures', count, len(to_render))
+            rendered[cache_key], render_timings[cache_key] = _render_heatmap(heatmap, width)
+    else:
+        # spawn a fresh interpreter to not fork the threads of the app server
+        executor = ProcessPoolExecutor(
+            max_workers=min(workers, len(to_render)),
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        try:
+            futures = {
+                cache_key: executor.submit(_render_heatmap, heatmap, width)
+                for cache_key, (_, heatmap) in to_render.items()
+            }
+            for count, (cache_key, future) in enumerate(futures.items()):
+                if progress is not None:
+                    progress('render figures', count, len(to_render))
+                rendered[cache_key], render_timings[cache_key] = future.result()
+        finally:
+            # stop at once if the report fails or it is cancelled
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    if cache is not None and to_render:
+        for cache_key in to_render:
+            cache.put(cache_key, rendered[cache_key])
+        cache.evict()
+
+    for key, cache_key in cache_keys.items():
+        images[key] = rendered[cache_key]
+        rendered_key = to_render.get(cache_key, (None,))[0]
+        timings[key] = render_timings[cache_key] if rendered_key == key else 0
+        LOGGER.debug('Rendered figure %s in %.3f s.', key, timings[key])
+    LOGGER.info(
+        'Rendered %d of %d figures in %.2f s with %d workers (slowest figure: %.2f s).',
+        len(to_render), len(images), time.perf_counter() - start, workers,
+        max(timings.values())
+    )
+    return images, timings
+
+
+def heatmap_image(image: bytes, width: float) -> PdfImage:
+    """Get the flowable of a rendered heatmap."""
+    return PdfImage(BytesIO(image), width=width)
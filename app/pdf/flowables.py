@@ -2,9 +2,15 @@ from pdfrw import PdfReader
 from pdfrw.buildxobj import pagexobj
 from pdfrw.toreportlab import makerl
 
+import numpy as np
+
+from reportlab.lib import colors
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
+from reportlab.graphics.shapes import Drawing, Group, Line, Rect, String
 from reportlab.platypus import Flowable
 
+from pdf.heatmap import BINARY_COLORSCALE, colorscale_colors, hourly_runs, polygons_by_color
+
 
 class PdfImage(Flowable):
     """
@@ -28,10 +34,8 @@ class PdfImage(Flowable):
     """
 
     def __init__(self, filename_or_object, width=None, height=None, kind='direct', keep_ratio=True):
-        if hasattr(filename_or_object, 'read'):
-            filename_or_object.seek(0)
-        self.page = PdfReader(filename_or_object, decompress=False).pages[0]
-        self.xobj = pagexobj(self.page)
+        self._source = filename_or_object
+        self._read_page()
         self.imageWidth = width
         self.imageHeight = height
         x1, y1, x2, y2 = self.xobj.BBox
@@ -59,6 +63,23 @@ class PdfImage(Flowable):
             self.drawWidth = self._w*factor
             self.drawHeight = self._h*factor
 
+    def _read_page(self):
+        if hasattr(self._source, 'read'):
+            self._source.seek(0)
+        self.page = PdfReader(self._source, decompress=False).pages[0]
+        self.xobj = pagexobj(self.page)
+
+    def __getstate__(self):
+        # the pdfrw objects can not be pickled, e.g. to send the flowables of
+        # a section worker, so the page is read again from the source
+        state = self.__dict__.copy()
+        del state['page'], state['xobj']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._read_page()
+
     def wrap(self, availableWidth, availableHeight):
         """
         returns draw- width and height
@@ -127,3 +148,166 @@ class CentrePadder(Flowable):
 
     def __delattr__(self,a):
         delattr(self.__f,a)
+
+
+class AnnualHeatmap(Drawing):
+    """A heatmap of 8760 hourly values drawn with vector graphics.
+
+    This is the native equivalent of the Plotly heatmaps in plot.py. The layout
+    follows the 700 by 350 pixel Plotly figures and is scaled to the width of
+    the drawing. The days are on the x-axis and the hours of the day on the
+    y-axis. Neighbouring days with the same color are merged into one rectangle.
+
+    Args:
+        values: The 8760 hourly values.
+        width: Width of the drawing. The height is half of the width.
+        title: Title of the heatmap.
+        colorscale: A list of (position, rgb) tuples. See colorscale_colors.
+        zmin: The value at the start of the colorscale.
+        zmax: The value at the end of the colorscale.
+        colorbar_ticks: A list of (value, text) tuples for the colorbar. If
+            None, evenly spaced ticks are added.
+        colorbar_title: Optional title above the colorbar.
+        title_y: Vertical position of the title from 0 (bottom) to 1 (top).
+    """
+    # layout of the Plotly figures in pixels
+    FIGURE_WIDTH, FIGURE_HEIGHT = 700, 350
+    PLOT_LEFT, PLOT_RIGHT, PLOT_TOP, PLOT_BOTTOM = 56, 574, 50, 320
+    COLORBAR_LEFT, COLORBAR_THICKNESS, COLORBAR_PAD = 588, 20, 10
+    FONT_NAME = 'Helvetica'
+    FONT_COLOR = colors.Color(42 / 255, 63 / 255, 95 / 255)
+    MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+    MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+    def __init__(
+            self, values: np.ndarray, width: float, title: str, colorscale: list,
+            zmin: float = 0, zmax: float = 1, colorbar_ticks: list = None,
+            colorbar_title: str = None, title_y: float = 0.95
+        ):
+        self._scale = width / self.FIGURE_WIDTH
+        super().__init__(width, self.FIGURE_HEIGHT * self._scale)
+        self.add(self._cells(values, colorscale, zmin, zmax))
+        self.add(self._axes())
+        self.add(self._colorbar(colorscale, zmin, zmax, colorbar_ticks, colorbar_title))
+        self.add(self._string(self.FIGURE_WIDTH / 2, self.FIGURE_HEIGHT * (1 - title_y) + 12, title, 17, 'middle'))
+
+    def _x(self, x: float) -> float:
+        return x * self._scale
+
+    def _y(self, y: float) -> float:
+        # Plotly pixels are measured from the top
+        return (self.FIGURE_HEIGHT - y) * self._scale
+
+    def _string(self, x: float, y: float, text: str, font_size: float, anchor: str = 'start') -> String:
+        return String(
+            self._x(x), self._y(y), text, fontName=self.FONT_NAME,
+            fontSize=font_size * self._scale, fillColor=self.FONT_COLOR, textAnchor=anchor
+        )
+
+    def _cells(self, values, colorscale, zmin, zmax) -> Group:
+        rgb = colorscale_colors(values, colorscale, zmin, zmax)
+        corners, run_colors = hourly_runs(rgb)
+        points = np.empty_like(corners)
+        points[..., 0] = np.interp(corners[..., 0], [0, 365], [self._x(self.PLOT_LEFT), self._x(self.PLOT_RIGHT)])
+        points[..., 1] = np.interp(corners[..., 1], [0, 24], [self._y(self.PLOT_BOTTOM), self._y(self.PLOT_TOP)])
+        return Group(*polygons_by_color(points, run_colors))
+
+    def _axes(self) -> Group:
+        group = Group()
+        left, right = self._x(self.PLOT_LEFT), self._x(self.PLOT_RIGHT)
+        bottom, top = self._y(self.PLOT_BOTTOM), self._y(self.PLOT_TOP)
+        hour_height = (self.PLOT_BOTTOM - self.PLOT_TOP) / 24
+        # horizontal lines marking the occupancy schedule
+        for hour in (7.5, 17.5):
+            y = self._y(self.PLOT_BOTTOM - (hour + 0.5) * hour_height)
+            group.add(Line(left, y, right, y, strokeColor=colors.black, strokeWidth=self._scale, strokeDashArray=[9 * self._scale, 9 * self._scale]))
+        group.add(Rect(left, bottom, right - left, top - bottom, fillColor=None, strokeColor=colors.black, strokeWidth=self._scale))
+        for hour in range(0, 24, 2):
+            y = self.PLOT_BOTTOM - (hour + 0.5) * hour_height
+            group.add(self._string(51.6, y + 4.2, str(hour), 12, 'end'))
+        day_width = (self.PLOT_RIGHT - self.PLOT_LEFT) / 365
+        first_day = 0
+        for month, days in zip(self.MONTHS, self.MONTH_DAYS):
+            x = self.PLOT_LEFT + (first_day + days / 2) * day_width
+            group.add(self._string(x, 335.4, month, 12, 'middle'))
+            first_day += days
+        # the y-axis title is rotated around its anchor
+        y_title = String(
+            0, 0, 'Hours of the day', fontName=self.FONT_NAME, fontSize=14 * self._scale,
+            fillColor=self.FONT_COLOR, textAnchor='middle'
+        )
+        group.add(Group(y_title, transform=(0, 1, -1, 0, self._x(21.5), self._y(185))))
+        return group
+
+    def _colorbar(self, colorscale, zmin, zmax, ticks, title) -> Group:
+        group = Group()
+        left = self._x(self.COLORBAR_LEFT)
+        width = self.COLORBAR_THICKNESS * self._scale
+        colorbar_top = self.PLOT_TOP + self.COLORBAR_PAD
+        colorbar_bottom = self.PLOT_BOTTOM - self.COLORBAR_PAD
+        bottom, top = self._y(colorbar_bottom), self._y(colorbar_top)
+        height = top - bottom
+        # one rectangle for each solid segment of the colorscale and thin
+        # rectangles for the gradients
+        for (start, start_rgb), (end, end_rgb) in zip(colorscale[:-1], colorscale[1:]):
+            if end == start:
+                continue
+            steps = 1 if tuple(start_rgb) == tuple(end_rgb) else max(1, int(round((end - start) * 64)))
+            positions = np.linspace(start, end, steps + 1)
+            centers = (positions[:-1] + positions[1:]) / 2
+            step_colors = colorscale_colors(zmin + centers * (zmax - zmin), colorscale, zmin, zmax)
+            for position, next_position, rgb in zip(positions[:-1], positions[1:], step_colors):
+                color = colors.Color(*(rgb / 255))
+                group.add(Rect(
+                    left, bottom + position * height, width, (next_position - position) * height,
+                    fillColor=color, strokeColor=color, strokeWidth=0
+                ))
+        if ticks is None:
+            ticks = [(value, f'{value:g}') for value in _nice_ticks(zmin, zmax)]
+        for value, text in ticks:
+            position = (value - zmin) / ((zmax - zmin) or 1)
+            y = colorbar_bottom - position * (colorbar_bottom - colorbar_top)
+            group.add(self._string(self.COLORBAR_LEFT + self.COLORBAR_THICKNESS + 3, y + 4.2, text, 12))
+        if title:
+            group.add(self._string(self.COLORBAR_LEFT, colorbar_top - 6, title, 14))
+        return group
+
+
+def grid_heatmap(grid_id: str, hoys: list, width: float) -> AnnualHeatmap:
+    """Heatmap of the hours where a sensor grid fails the 2% rule.
+
+    This is the native equivalent of plot.figure_grids.
+    """
+    values = np.zeros(8760)
+    values[np.asarray(hoys, dtype=int)] = 1
+    return AnnualHeatmap(
+        values, width, grid_id, BINARY_COLORSCALE,
+        colorbar_ticks=[(0.25, 'Pass'), (0.75, 'Fail')]
+    )
+
+
+def aperture_group_heatmap(aperture_group: str, values: np.ndarray, shd_trans: float, width: float) -> AnnualHeatmap:
+    """Heatmap of the shading schedule of an aperture group.
+
+    This is the native equivalent of plot.figure_aperture_group_values.
+    """
+    title = aperture_group
+    if shd_trans is not None:
+        title += ' - Shading transmittance: ' + '{:.0%}'.format(round(shd_trans, 3))
+    return AnnualHeatmap(
+        values, width, title, BINARY_COLORSCALE,
+        colorbar_ticks=[(0.25, 'Shading off'), (0.75, 'Shading on')]
+    )
+
+
+def _nice_ticks(zmin: float, zmax: float, count: int = 5) -> np.ndarray:
+    """Get round tick values between zmin and zmax."""
+    span = zmax - zmin
+    if span <= 0:
+        return np.array([zmin])
+    step = 10 ** np.floor(np.log10(span / count))
+    for factor in (1, 2, 5, 10):
+        if span / (step * factor) <= count:
+            step *= factor
+            break
+    return np.arange(np.ceil(zmin / step) * step, zmax + step * 1e-9, step)
@@ -0,0 +1,199 @@
+import numpy as np
+
+from reportlab.lib import colors
+from reportlab.graphics.shapes import Path, FILL_NON_ZERO
+
+from ladybug.color import ColorRange
+from ladybug_geometry.geometry3d.mesh import Mesh3D
+
+
+_MOVETO, _LINETO, _CURVETO, _CLOSEPATH = range(4)
+
+# control point distance of the cubic bezier curves approximating a quarter
+# of a circle
+_KAPPA = 4 * (np.sqrt(2) - 1) / 3
+
+
+def mesh_face_points(mesh: Mesh3D) -> np.ndarray:
+    """Get the XY coordinates of the vertices of each mesh face.
+
+    Returns an array of shape (faces, 4, 2). The last vertex of triangular faces
+    is repeated so triangles and quads can be processed together.
+    """
+    vertices = np.array([(vertex.x, vertex.y) for vertex in mesh.vertices])
+    faces = np.array([face if len(face) == 4 else face + (face[-1],) for face in mesh.faces])
+    return vertices[faces]
+
+
+def mesh_face_centroids(mesh: Mesh3D) -> np.ndarray:
+    """Get the XY coordinates of the centroid of each mesh face."""
+    return np.array([(centroid.x, centroid.y) for centroid in mesh.face_centroids])
+
+
+def project_points(points: np.ndarray, bounds_min, bounds_max, width: float, height: float) -> np.ndarray:
+    """Map model XY coordinates to drawing coordinates.
+
+    This is the vectorized equivalent of calling np.interp on each coordinate.
+    Points outside the bounds are clamped to the edges of the drawing.
+    """
+    projected = np.empty_like(points, dtype=float)
+    projected[..., 0] = np.interp(points[..., 0], [bounds_min.x, bounds_max.x], [0, width])
+    projected[..., 1] = np.interp(points[..., 1], [bounds_min.y, bounds_max.y], [0, height])
+    return projected
+
+
+def values_to_colors(values: np.ndarray, color_range: ColorRange) -> np.ndarray:
+    """Get the RGB color of each value in a ColorRange.
+
+    This gives the same colors as calling ColorRange.color for each value.
+    Returns an integer array of shape (values, 3).
+    """
+    values = np.asarray(values, dtype=float)
+    domain = np.asarray(color_range.domain, dtype=float)
+    rgb = np.array([(color.r, color.g, color.b) for color in color_range.colors], dtype=float)
+    # index of the domain segment of each value
+    index = np.clip(np.searchsorted(domain, values, side='left') - 1, 0, len(domain) - 2)
+    if color_range.continuous_colors:
+        range_min = domain[index]
+        range_p = domain[index + 1] - range_min
+        factor = np.divide(values - range_min, range_p, out=np.zeros_like(values), where=range_p != 0)
+        min_color = rgb[index]
+        max_color = rgb[index + 1]
+        result = np.round(factor[:, None] * (max_color - min_color) + min_color)
+    else:
+        result = rgb[index + 1]
+    result[values < domain[0]] = rgb[0]
+    result[values > domain[-1]] = rgb[-1]
+    return result.astype(int)
+
+
+def _fill_color(rgb) -> colors.Color:
+    return colors.Color(rgb[0] / 255, rgb[1] / 255, rgb[2] / 255)
+
+
+def _group_by_color(rgb: np.ndarray):
+    """Yield each unique color and the indices of the items with that color."""
+    unique_colors, inverse = np.unique(rgb, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    order = np.argsort(inverse, kind='stable')
+    splits = np.cumsum(np.bincount(inverse, minlength=len(unique_colors)))[:-1]
+    for color, indices in zip(unique_colors, np.split(order, splits)):
+        yield color, indices
+
+
+def polygons_by_color(face_points: np.ndarray, rgb: np.ndarray) -> list:
+    """Create one Path for each color with all the faces of that color.
+
+    Args:
+        face_points: Drawing coordinates of the faces as an array of shape
+            (faces, vertices, 2).
+        rgb: Integer RGB color of each face as an array of shape (faces, 3).
+    """
+    vertex_count = face_points.shape[1]
+    face_operators = [_MOVETO] + [_LINETO] * (vertex_count - 1) + [_CLOSEPATH]
+    paths = []
+    for color, indices in _group_by_color(rgb):
+        fill_color = _fill_color(color)
+        paths.append(
+            Path(
+                points=face_points[indices].reshape(-1).tolist(),
+                operators=face_operators * len(indices),
+                fillColor=fill_color, strokeColor=fill_color, strokeWidth=0,
+                fillMode=FILL_NON_ZERO
+            )
+        )
+    return paths
+
+
+def circles_by_color(centers: np.ndarray, radii: np.ndarray, rgb: np.ndarray) -> list:
+    """Create one Path for each color with all the circles of that color.
+
+    Each circle is drawn with four cubic bezier curves.
+
+    Args:
+        centers: Drawing coordinates of the circle centers as an array of
+            shape (circles, 2).
+        radii: Radius of each circle.
+        rgb: Integer RGB color of each circle as an array of shape (circles, 3).
+    """
+    cx, cy = centers[:, 0], centers[:, 1]
+    r = np.asarray(radii, dtype=float)
+    k = _KAPPA * r
+    circle_points = np.stack([
+        cx + r, cy,
+        cx + r, cy + k, cx + k, cy + r, cx, cy + r,
+        cx - k, cy + r, cx - r, cy + k, cx - r, cy,
+        cx - r, cy - k, cx - k, cy - r, cx, cy - r,
+        cx + k, cy - r, cx + r, cy - k, cx + r, cy
+    ], axis=1)
+    circle_operators = [_MOVETO] + [_CURVETO] * 4 + [_CLOSEPATH]
+    paths = []
+    for color, indices in _group_by_color(rgb):
+        paths.append(
+            Path(
+                points=circle_points[indices].reshape(-1).tolist(),
+                operators=circle_operators * len(indices),
+                fillColor=_fill_color(color), strokeColor=None, strokeWidth=0,
+                fillMode=FILL_NON_ZERO
+            )
+        )
+    return paths
+
+
+def threshold_colors(passing: np.ndarray, pass_color: tuple, fail_color: tuple) -> np.ndarray:
+    """Get an RGB color for each item based on a pass/fail mask."""
+    return np.where(np.asarray(passing)[:, None], pass_color, fail_color)
+
+
+# the pass/fail and shading on/off colorscale of the Plotly heatmaps
+BINARY_COLORSCALE = [(0, (90, 255, 90)), (0.5, (90, 255, 90)), (0.5, (255, 90, 90)), (1, (255, 90, 90))]
+
+
+def colorscale_colors(values: np.ndarray, colorscale: list, zmin: float, zmax: float) -> np.ndarray:
+    """Get the RGB color of each value in a Plotly style colorscale.
+
+    Args:
+        values: The values to color.
+        colorscale: A list of (position, rgb) tuples where the positions go
+            from 0 to 1. The values are interpolated linearly between the
+            positions, a position repeated twice gives a hard step.
+        zmin: The value at position 0. Smaller values get the first color.
+        zmax: The value at position 1. Larger values get the last color.
+
+    Returns an integer array of shape (values, 3).
+    """
+    values = np.asarray(values, dtype=float)
+    positions = np.array([position for position, _ in colorscale], dtype=float)
+    rgb = np.array([color for _, color in colorscale], dtype=float)
+    normalized = np.clip((values - zmin) / ((zmax - zmin) or 1), 0, 1)
+    # np.interp takes the right hand color at a repeated position
+    result = np.stack([np.interp(normalized, positions, rgb[:, i]) for i in range(3)], axis=1)
+    return np.round(result).astype(int)
+
+
+def hourly_runs(rgb: np.ndarray) -> tuple:
+    """Merge the cells of an annual heatmap into runs of days with the same color.
+
+    Args:
+        rgb: Integer RGB color of each hour of the year as an array of shape
+            (8760, 3).
+
+    Returns:
+        A tuple with the corners of each run as an array of shape (runs, 4, 2)
+        in (day, hour) cell units and the RGB color of each run.
+    """
+    # one row for each hour of the day and one column for each day
+    grid = rgb.reshape(365, 24, 3).transpose(1, 0, 2)
+    change = np.any(grid[:, 1:] != grid[:, :-1], axis=2)
+    starts = np.concatenate([np.ones((24, 1), dtype=bool), change], axis=1)
+    hours, start_days = np.nonzero(starts)
+    # a run ends where the next run of the same hour starts or at the end of the year
+    end_days = np.append(start_days[1:], 365)
+    end_days[np.append(hours[1:] != hours[:-1], True)] = 365
+    corners = np.stack([
+        np.stack([start_days, hours], axis=1),
+        np.stack([end_days, hours], axis=1),
+        np.stack([end_days, hours + 1], axis=1),
+        np.stack([start_days, hours + 1], axis=1)
+    ], axis=1)
+    return corners.astype(float), grid[hours, start_days]
@@ -0,0 +1,101 @@
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+class ReportCancelled(Exception):
+    """The report was cancelled."""
+
+
+class ReportProgress:
+    """Report the progress of a report and check if the report is cancelled.
+
+    An instance is called at each step of each stage of the report. The
+    elapsed time of each stage is recorded in timings.
+
+    Args:
+        callback: An optional function that is called with the stage, the
+            number of steps that are done, the total number of steps of the
+            stage and the elapsed time of the stage in seconds.
+        is_cancelled: An optional function that returns True if the report is
+            cancelled. It is checked at each step and ReportCancelled is raised
+            once it returns True.
+    """
+
+    def __init__(
+            self, callback: Callable[[str, int, int, float], None] = None,
+            is_cancelled: Callable[[], bool] = None):
+        self.callback = callback
+        self.is_cancelled = is_cancelled
+        self.timings: Dict[str, float] = {}
+        self.stage: Optional[str] = None
+        self._stage_start = time.perf_counter()
+        self._build_pass = 0
+        self._build_size = 0
+
+    def __call__(self, stage: str, done: int = 0, total: int = 0) -> None:
+        if self.is_cancelled is not None and self.is_cancelled():
+            raise ReportCancelled(f'The report was cancelled during {stage}.')
+        now = time.perf_counter()
+        if stage != self.stage:
+            self.stage = stage
+            self._stage_start = now
+        self.timings[stage] = now - self._stage_start
+        if self.callback is not None:
+            self.callback(stage, done, total, self.timings[stage])
+
+    def build_callback(self, typ: str, value: int) -> None:
+        """A progress callback for the passes of BaseDocTemplate.multiBuild."""
+        if typ == 'STARTED':
+            self._build_pass += 1
+            self._build_size = 0
+        elif typ == 'SIZE_EST':
+            self._build_size = value
+        elif typ == 'PROGRESS':
+            self(f'build pass {self._build_pass}', value, self._build_size)
+
+
+class FileProgress:
+    """Write the progress of a report to a JSON file and cancel the report when
+    a cancel file exists.
+
+    The files make it possible to follow and cancel a report that is created in
+    another process.
+
+    Args:
+        progress_file: The JSON file to write the progress to.
+        cancel_file: The report is cancelled once this file exists.
+        interval: Minimum time in seconds between two writes of the progress
+            file. The file is always written when a new stage starts.
+    """
+
+    def __init__(self, progress_file: Path, cancel_file: Path, interval: float = 0.5):
+        self.progress_file = Path(progress_file)
+        self.cancel_file = Path(cancel_file)
+        self.interval = interval
+        self.progress = ReportProgress(self._write, self.cancel_file.exists)
+        self._last_write = 0
+        self._last_stage = None
+
+    def _write(self, stage: str, done: int, total: int, elapsed: float) -> None:
+        now = time.perf_counter()
+        if stage == self._last_stage and now - self._last_write < self.interval:
+            return
+        self._last_write, self._last_stage = now, stage
+        temp_file = self.progress_file.with_suffix('.tmp')
+        with open(temp_file, 'w') as json_file:
+            json.dump({
+                'stage': stage, 'done': done, 'total': total,
+                'timings': self.progress.timings
+            }, json_file)
+        temp_file.replace(self.progress_file)
+
+
+def read_progress(progress_file: Path) -> Optional[dict]:
+    """Read a progress file. Returns None if the file does not exist yet."""
+    try:
+        with open(progress_file) as json_file:
+            return json.load(json_file)
+    except (OSError, ValueError):
+        return None
@@ -1,3 +1,5 @@
+from io import BytesIO
+
 from reportlab.pdfgen import canvas
 from reportlab.platypus import BaseDocTemplate, Paragraph
 from reportlab.pdfbase.pdfmetrics import stringWidth
@@ -29,7 +31,12 @@ class MyDocTemplate(BaseDocTemplate):
 
 
 class NumberedPageCanvas(canvas.Canvas):
-    """
+    """A canvas that draws "Page x of y" on each page.
+
+    The page count is only known once the last page is shown. Each page draws
+    a form XObject with its page number and the forms are defined in save()
+    when the page count is known. No state of the pages is kept until then.
+
     http://code.activestate.com/recipes/546511-page-x-of-y-with-reportlab/
     http://code.activestate.com/recipes/576832/
     http://www.blog.pythonlibrary.org/2013/08/12/reportlab-how-to-add-page-numbers/
@@ -41,36 +48,62 @@ class NumberedPageCanvas(canvas.Canvas):
         self.skip_pages = kwargs.pop('skip_pages', 0)
         self.start_on_skip_pages = kwargs.pop('start_on_skip_pages', None)
         super().__init__(*args, **kwargs)
-        self.pages = []
+
+    @staticmethod
+    def _page_number_form(page_number):
+        return 'pageNumber%s' % page_number
 
     def showPage(self):
-        """On a page break, add information to the list."""
-        self.pages.append(dict(self.__dict__))
-        self._doc.pageCounter += 1
-        self._startPage()
+        """On a page break, draw the form of the page number."""
+        if self._pageNumber > self.skip_pages:
+            self.saveState()
+            self.doForm(self._page_number_form(self._pageNumber))
+            self.restoreState()
+        super().showPage()
 
     def save(self):
-        """Add the page number to each page (page x of y)."""
-        page_count = len(self.pages)
+        """Define the forms of the page numbers (page x of y)."""
+        if len(self._code):
+            self.showPage()
+        page_count = self._pageNumber - 1
 
-        for page in self.pages:
-            self.__dict__.update(page)
-            self.draw_page_number(page_count)
-            super().showPage()
+        for page_number in range(self.skip_pages + 1, page_count + 1):
+            self.beginForm(self._page_number_form(page_number))
+            draw_page_number(
+                self, page_number, page_count, self.skip_pages, self.start_on_skip_pages)
+            self.endForm()
 
         super().save()
 
-    def draw_page_number(self, page_count):
-        """Add the page number."""
-        if self._pageNumber > self.skip_pages:
-            if self.start_on_skip_pages:
-                page = "Page %s of %s" % (self._pageNumber - self.skip_pages, page_count - self.skip_pages)
-                self.setFont("Helvetica", 9)
-                self.drawRightString(195 * mm, 15 * mm, page)
-            else:
-                page = "Page %s of %s" % (self._pageNumber, page_count)
-                self.setFont("Helvetica", 9)
-                self.drawRightString(195 * mm, 15 * mm, page)
+
+def draw_page_number(canvas, page_number, page_count, skip_pages=0, start_on_skip_pages=None):
+    """Draw the "Page x of y" footer of a page."""
+    if page_number > skip_pages:
+        if start_on_skip_pages:
+            page = "Page %s of %s" % (page_number - skip_pages, page_count - skip_pages)
+            canvas.setFont("Helvetica", 9)
+            canvas.drawRightString(195 * mm, 15 * mm, page)
+        else:
+            page = "Page %s of %s" % (page_number, page_count)
+            canvas.setFont("Helvetica", 9)
+            canvas.drawRightString(195 * mm, 15 * mm, page)
+
+
+def page_number_overlay(page_count, pagesize, skip_pages=0, start_on_skip_pages=None) -> BytesIO:
+    """Create a PDF with only the page numbers of a document.
+
+    The pages of the overlay are merged on the pages of a document that is
+    built in chunks. The page numbers look the same as the page numbers of
+    NumberedPageCanvas.
+    """
+    overlay = BytesIO()
+    numbers_canvas = canvas.Canvas(overlay, pagesize=pagesize)
+    for page_number in range(1, page_count + 1):
+        draw_page_number(numbers_canvas, page_number, page_count, skip_pages, start_on_skip_pages)
+        numbers_canvas.showPage()
+    numbers_canvas.save()
+    overlay.seek(0)
+    return overlay
 
 
 def _header(canvas, doc, content, logo: None):
@@ -1,18 +1,49 @@
 """Functions to support plots."""
-import json
-from pathlib import Path
+from functools import lru_cache
+from typing import NamedTuple
+
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
 
-from ladybug.datacollection import HourlyContinuousCollection
-from ladybug.datatype.base import DataTypeBase
-from ladybug.header import Header
 from ladybug.color import Colorset
-from ladybug.analysisperiod import AnalysisPeriod
 from ladybug_charts._to_dataframe import dataframe
 from ladybug_charts._helper import rgb_to_hex
-from ladybug_pandas.series import Series
+
+
+class HourlyCalendar(NamedTuple):
+    """The x, y and hover values shared by all annual heatmaps."""
+    hour: np.ndarray
+    date: np.ndarray
+    month_names: np.ndarray
+    day: np.ndarray
+    customdata: np.ndarray
+
+
+@lru_cache(maxsize=1)
+def hourly_calendar() -> HourlyCalendar:
+    """Get the 8760 hour calendar of the annual heatmaps.
+
+    The calendar is created once per process. The arrays are read-only as they
+    are shared by all figures.
+    """
+    df = dataframe()
+    calendar = HourlyCalendar(
+        hour=df['hour'].to_numpy(),
+        date=df['UTC_time'].dt.date.to_numpy(),
+        month_names=df['month_names'].to_numpy(),
+        day=df['day'].to_numpy(),
+        customdata=np.stack((df['month_names'], df['day']), axis=-1)
+    )
+    for array in calendar:
+        array.flags.writeable = False
+    return calendar
+
+
+def _customdata(categories: list, values: np.ndarray) -> np.ndarray:
+    """Add the category of each value to the month and day of the calendar."""
+    category = np.array(categories, dtype=object)[np.asarray(values, dtype=int)]
+    return np.column_stack((hourly_calendar().customdata, category))
 
 
 def get_figure_config(title: str) -> dict:
@@ -28,31 +59,21 @@ def get_figure_config(title: str) -> dict:
     }
 
 def figure_grids(grid_id: str, states_schedule_err: dict):
-    data_type = DataTypeBase(grid_id)
-    hoys = states_schedule_err[grid_id]
-    analysis_period = AnalysisPeriod()
-    values = [0] * 8760
-    for hoy in hoys:
-        values[hoy] = 1
-    header = Header(data_type=data_type, unit=None, analysis_period=analysis_period)
-    hourly_data = HourlyContinuousCollection(header=header, values=values)
-
-    df = dataframe()
-    series = Series(hourly_data)
-    df["value"] = series.values
+    values = np.zeros(8760)
+    values[np.asarray(states_schedule_err[grid_id], dtype=int)] = 1
+    calendar = hourly_calendar()
 
     category = ["Pass", "Fail"]
-    df["pass/fail"] = [category[int(value)] for value in df["value"]]
 
     fig = go.Figure(
         data=go.Heatmap(
-            y=df["hour"],
-            x=df["UTC_time"].dt.date,
-            z=df["value"],
+            y=calendar.hour,
+            x=calendar.date,
+            z=values,
             zmin=0,
             zmax=1,
             colorscale=[[0, "rgb(90,255,90)"], [0.5, "rgb(90,255,90)"], [0.5, "rgb(255,90,90)"], [1, "rgb(255,90,90)"]],
-            customdata=np.stack((df["month_names"], df["day"], df["pass/fail"]), axis=-1),
+            customdata=_customdata(category, values),
             hovertemplate=(
                 "<b>"
                 + grid_id
@@ -96,16 +117,13 @@ def figure_grids(grid_id: str, states_schedule_err: dict):
     return fig
 
 
-def figure_aperture_group_schedule(aperture_group: str,
-    states_schedule: HourlyContinuousCollection):
-
-    df = dataframe()
-    series = Series(states_schedule)
-    df["value"] = series.values
+def figure_aperture_group_values(aperture_group: str, values: np.ndarray,
+    shd_trans: float = None):
+    """Figure of the shading schedule of an aperture group from the raw values."""
+    calendar = hourly_calendar()
 
     category = ['Shading off', 'Shading on']
 
-    shd_trans = states_schedule.header.metadata.get('Shade Transmittance', None)
     if shd_trans is None:
         hovertemplate = (
             "<b>"
@@ -121,18 +139,15 @@ def figure_aperture_group_schedule(aperture_group: str,
             + "</b><br>Month: %{customdata[0]}<br>Day: %{customdata[1]}<br>"
             + "Hour: %{y}:00<br>"
         )
-    #df['value'] = df['value'].replace(1, 0).replace(shd_trans, 1)
-    df['shading'] = [category[int(value)] for value in df['value']]
-
     fig = go.Figure(
         data=go.Heatmap(
-            y=df["hour"],
-            x=df["UTC_time"].dt.date,
-            z=df["value"],
+            y=calendar.hour,
+            x=calendar.date,
+            z=values,
             zmin=0,
             zmax=1,
             colorscale=[[0, "rgb(90,255,90)"], [0.5, "rgb(90,255,90)"], [0.5, "rgb(255,90,90)"], [1, "rgb(255,90,90)"]],
-            customdata=np.stack((df["month_names"], df["day"], df['shading']), axis=-1),
+            customdata=_customdata(category, values),
             hovertemplate=hovertemplate,
             name="",
             colorbar=dict(
@@ -179,28 +194,22 @@ def figure_aperture_group_schedule(aperture_group: str,
     return fig
 
 
-def figure_ase(grid_info: dict, results_folder: Path):
-    full_id = grid_info['full_id']
+def figure_ase(grid_info: dict, values: np.ndarray):
     grid_name = grid_info['name']
-    with open (results_folder.joinpath(f'{full_id}.json')) as file:
-        data_dict = json.load(file)
-    hourly_data = HourlyContinuousCollection.from_dict(data_dict)
 
-    df = dataframe()
-    series = Series(hourly_data)
-    df["value"] = series.values
+    calendar = hourly_calendar()
 
     colors = Colorset.original()
 
     fig = go.Figure(
         data=go.Heatmap(
-            y=df["hour"],
-            x=df["UTC_time"].dt.date,
-            z=df["value"],
+            y=calendar.hour,
+            x=calendar.date,
+            z=values,
             zmin=st.session_state['legend_min'],
             zmax=st.session_state['legend_max'],
             colorscale=[rgb_to_hex(color) for color in colors],
-            customdata=np.stack((df["month_names"], df["day"]), axis=-1),
+            customdata=calendar.customdata,
             hovertemplate=(
                 "<b>"
                 + grid_name
@@ -1,15 +1,15 @@
 """Functions to support the leed-daylight-option-one app."""
-import json
-from pathlib import Path
+from collections.abc import Mapping
 import pandas as pd
 
 import streamlit as st
-from ladybug.datacollection import HourlyContinuousCollection
 
 from on_change import (radio_show_all_grids, radio_show_all,
     multiselect_grids, multiselect_aperture_groups, radio_show_all_ase,
     multiselect_ase, legend_min_on_change, legend_max_on_change)
-from plot import figure_grids, figure_aperture_group_schedule, figure_ase, get_figure_config
+from plot import figure_grids, figure_aperture_group_values, figure_ase, get_figure_config
+from results import load_json, load_datacollections
+from results_source import FolderResults
 
 UNITS_AREA = {
     'Meters': 'm',
@@ -247,8 +247,11 @@ def process_space(summary_grid: dict, states_schedule_err: dict):
     )
 
 
-def process_states_schedule(states_schedule: dict):
-    """Process states schedule."""
+def process_states_schedule(states_schedule: Mapping):
+    """Process states schedule.
+
+    The states schedule is a HourlyMatrix or a StatesSchedule.
+    """
     st.info(
         'Visualize shading schedules of each aperture group.'
     )
@@ -282,22 +285,22 @@ def process_states_schedule(states_schedule: dict):
     )
 
     for aperture_group in st.session_state['select_aperture_groups']:
-        datacollection = \
-            HourlyContinuousCollection.from_dict(states_schedule[aperture_group])
-        fig = figure_aperture_group_schedule(aperture_group, datacollection)
+        shd_trans = states_schedule.header(aperture_group).get('metadata', {}).get('Shade Transmittance', None)
+        fig = figure_aperture_group_values(
+            aperture_group, states_schedule.array(aperture_group), shd_trans)
         st.plotly_chart(fig, use_container_width=True, config=get_figure_config(aperture_group))
 
 
-def process_ase(folder: Path):
+def process_ase(results: FolderResults):
     """Process ASE."""
     st.info(
         'Visualize the percentage of floor area where the direct illuminance '
         'is larger than 1000.'
     )
 
-    results_folder = folder.joinpath('datacollections', 'ase_percentage_above')
-    with open(results_folder.joinpath('grids_info.json')) as json_file:
-        grids_info = json.load(json_file)
+    datacollections_folder = 'datacollections/ase_percentage_above'
+    grids_info = load_json(results.path(f'{datacollections_folder}/grids_info.json'))
+    ase_percentage = load_datacollections(results, datacollections_folder)
 
     grid_ids = [grid_info['full_id'] for grid_info in grids_info]
     if not 'show_all_ase' in st.session_state:
@@ -338,4 +341,4 @@ def process_ase(folder: Path):
             key='legend_max', on_change=legend_max_on_change)
 
     for grid_info in st.session_state['select_ase']:
-        figure_ase(grid_info, results_folder)
+        figure_ase(grid_info, ase_percentage.array(grid_info['full_id']))
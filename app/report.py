@@ -2,7 +2,47 @@ import streamlit as st
 
 from pollination_io.api.user import UserApi
 
-from pdf_report import create_pdf
+from download import weather_location
+from report_queue import report_queue
+from run_metadata import run_metadata, session_cache
+
+
+# the progress of a report is updated every second
+PROGRESS_INTERVAL = 1
+
+
+def _get_user(user_api: UserApi) -> dict:
+    """Get the user of the session. The user is cached in the session."""
+    return session_cache('user', user_api.get_user)
+
+
+@st.fragment(run_every=PROGRESS_INTERVAL)
+def _report_progress(key: str):
+    """Show the progress of a report job. Only this fragment is rerun to
+    update the progress until the job is done."""
+    queue = report_queue()
+    job = queue.job(key)
+    if job is None or job.result is not None:
+        # show the result in a rerun of the app
+        st.rerun()
+    position = queue.position(job.key)
+    progress = job.progress
+    if position:
+        st.info(f'The report is number {position} in the queue.')
+    elif progress is None:
+        st.info('Generating report...')
+    else:
+        fraction = progress['done'] / progress['total'] if progress['total'] else 0
+        st.progress(
+            min(fraction, 1.0),
+            text=f'{progress["stage"].capitalize()} ({progress["done"]} of {progress["total"]})'
+            if progress['total'] else progress['stage'].capitalize()
+        )
+        st.caption(', '.join(
+            f'{stage} {seconds:.1f} s' for stage, seconds in progress['timings'].items()))
+    if st.button('Cancel', key='cancel_report'):
+        queue.cancel(job.key)
+        st.rerun()
 
 
 def export_report(user_api: UserApi):
@@ -11,12 +51,8 @@ def export_report(user_api: UserApi):
     report_data = {}
     if st.session_state.load_method == 'Try the sample run':
         project_name = st.text_input('Project Name', value='Sample Project')
-        prepared_by = st.text_input('Prepared By', value=user_api.get_user()['name'])
+        prepared_by = st.text_input('Prepared By', value=_get_user(user_api)['name'])
         project_folder = st.session_state.sample_folder
-        temp_folder = st.session_state.target_folder.joinpath('temp')
-        output_file = temp_folder.joinpath(f'report_{user_api.get_user()["username"]}.pdf')
-        if not temp_folder.exists():
-            temp_folder.mkdir()
         create_stories = st.checkbox('Create Stories', value=False,
             help='Check this box to create stories in the Honeybee Model. '
             'You should ideally create the stories before running the '
@@ -24,10 +60,12 @@ def export_report(user_api: UserApi):
             'the summaries for each story in case they are not modelled prior '
             'to running the recipe.')
     else:
-        project_name = st.text_input('Project Name', value=st.session_state.run.project)
-        prepared_by = st.text_input('Prepared By', value=user_api.get_user()['name'])
+        if st.session_state.load_method == 'Load local results':
+            project_name = st.text_input('Project Name', value='Local Project')
+        else:
+            project_name = st.text_input('Project Name', value=st.session_state.run.project)
+        prepared_by = st.text_input('Prepared By', value=_get_user(user_api)['name'])
         project_folder = st.session_state.run_folder
-        output_file = project_folder.joinpath('report.pdf')
         create_stories = st.checkbox('Create Stories', value=False,
             help='Check this box to create stories in the Honeybee Model. '
             'You should ideally create the stories before running the '
@@ -37,14 +75,27 @@ def export_report(user_api: UserApi):
     report_data['prepared_by'] = prepared_by
     report_data['project'] = project_name
 
+    queue = report_queue()
     if st.button('Generate Report'):
-        with st.spinner('Generating report...'):
-            if output_file.exists():
-                output_file.unlink()
-            create_pdf(output_file, project_folder, st.session_state['run'], report_data, create_stories)
+        run = st.session_state['run']
+        if run is not None:
+            # the report is created without the run in a worker process so the
+            # metadata and the weather location must be in the run folder
+            weather_location(run, project_folder, run_metadata(run, project_folder))
+        st.session_state.report_job = queue.submit(project_folder, report_data, create_stories)
 
-    if output_file.exists():
-        with open(output_file, 'rb') as pdf_file:
+    job = queue.job(st.session_state.report_job)
+    if job is None or job.run_folder != project_folder:
+        return
+    result = job.result
+    if result is None:
+        _report_progress(job.key)
+    elif result.cancelled:
+        st.warning(result.error)
+    elif result.error:
+        st.error(f'Failed to generate the report:\n\n{result.error}')
+    elif result.output_file.exists():
+        with open(result.output_file, 'rb') as pdf_file:
             pdf_bytes = pdf_file.read()
         st.download_button('Download Report',
                            data=pdf_bytes,
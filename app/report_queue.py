@@ -0,0 +1,222 @@
+"""Queue of the reports that are created for all sessions."""
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+import streamlit as st
+
+from batch_report import ReportResult, create_report
+from pdf.progress import read_progress
+
+
+REPORTS_FOLDER = Path(__file__).parent.joinpath('temp', 'reports')
+# the number of reports that are created at the same time can be set with the
+# REPORT_WORKERS environment variable
+DEFAULT_WORKERS = int(os.environ.get('REPORT_WORKERS', 2))
+# each report creates its level and room sections with REPORT_SECTION_WORKERS
+# processes
+DEFAULT_SECTION_WORKERS = int(os.environ.get('REPORT_SECTION_WORKERS', 1))
+# each report renders its heatmaps with REPORT_FIGURE_WORKERS processes. If it
+# is not set, pdf.figures.default_workers() is used
+DEFAULT_FIGURE_WORKERS = int(os.environ['REPORT_FIGURE_WORKERS']) \
+    if os.environ.get('REPORT_FIGURE_WORKERS') else None
+# large reports are built in chunks of REPORT_CHUNK_SIZE sections to bound their
+# memory. If it is not set, the reports are built at once
+DEFAULT_CHUNK_SIZE = int(os.environ['REPORT_CHUNK_SIZE']) \
+    if os.environ.get('REPORT_CHUNK_SIZE') else None
+# finished jobs are forgotten after an hour
+DEFAULT_KEEP_SECONDS = 60 * 60
+
+
+class ReportJob(NamedTuple):
+    key: str
+    run_folder: Path
+    output_file: Path
+    submitted_at: float
+    future: Future
+
+    @property
+    def files(self) -> List[Path]:
+        """The files the job writes."""
+        return [
+            self.output_file, self.progress_file,
+            # the temporary file FileProgress writes the progress file with
+            self.progress_file.with_suffix('.tmp'), self.cancel_file
+        ]
+
+    @property
+    def progress_file(self) -> Path:
+        return self.output_file.with_suffix('.progress.json')
+
+    @property
+    def cancel_file(self) -> Path:
+        return self.output_file.with_suffix('.cancel')
+
+    @property
+    def state(self) -> str:
+        """The state of the job: queued, running or done.
+
+        The worker writes the progress file once it starts the job. A job whose
+        future is already handed to a worker process is queued until then.
+        """
+        if self.future.done():
+            return 'done'
+        if self.progress_file.exists():
+            return 'running'
+        return 'queued'
+
+    @property
+    def progress(self) -> Optional[dict]:
+        """The last progress of the job or None if the job did not start."""
+        return read_progress(self.progress_file)
+
+    @property
+    def result(self) -> Optional[ReportResult]:
+        """The result of the job or None if the job is not done."""
+        if not self.future.done():
+            return None
+        if self.future.cancelled():
+            return ReportResult(
+                self.run_folder, self.output_file, 0,
+                'The report was cancelled before it started.', cancelled=True
+            )
+        try:
+            return self.future.result()
+        except Exception as error:
+            # the worker process died, e.g. it ran out of memory
+            return ReportResult(self.run_folder, self.output_file, 0, repr(error))
+
+
+class ReportQueue:
+    """Create reports in a bounded pool of processes shared by all sessions.
+
+    The reports are created in worker processes so they do not slow down the
+    interactive sessions of the app server. A job that is identical to a job
+    that is queued or running is not submitted again. The sessions that
+    submitted it share the same job. Each job writes its own files, so a job
+    that is submitted again after it finished never overwrites a report that
+    another session may still download.
+
+    Args:
+        workers: Number of reports that are created at the same time.
+        folder: The folder to write the reports to.
+        keep_seconds: Time in seconds finished jobs are kept in the queue.
+        section_workers: Number of processes each report creates its level and
+            room sections with.
+        chunk_size: Build the level and room sections of each report in
+            chunks of this many sections. If None, each report is built at
+            once.
+        figure_workers: Number of processes each report renders its heatmaps
+            with.
+    """
+
+    def __init__(
+            self, workers: int = DEFAULT_WORKERS, folder: Path = REPORTS_FOLDER,
+            keep_seconds: float = DEFAULT_KEEP_SECONDS,
+            section_workers: int = DEFAULT_SECTION_WORKERS,
+            chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+            figure_workers: Optional[int] = DEFAULT_FIGURE_WORKERS):
+        self.workers = workers
+        self.section_workers = section_workers
+        self.chunk_size = chunk_size
+        self.figure_workers = figure_workers
+        self.folder = Path(folder)
+        self.keep_seconds = keep_seconds
+        self._jobs: Dict[str, ReportJob] = {}
+        # finished jobs that were replaced by a job with the same key
+        self._replaced: List[ReportJob] = []
+        self._lock = threading.Lock()
+        # spawn a fresh interpreter to not fork the threads of the app server
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+    @staticmethod
+    def key(run_folder: Path, report_data: dict, create_stories: bool) -> str:
+        """Get the key of a job. Identical jobs have the same key."""
+        job = [str(run_folder.resolve()), report_data, create_stories]
+        return hashlib.sha256(json.dumps(job, sort_keys=True).encode()).hexdigest()[:16]
+
+    def _expired(self, job: ReportJob, now: float) -> bool:
+        return job.future.done() and now - job.submitted_at > self.keep_seconds
+
+    @staticmethod
+    def _remove_files(job: ReportJob) -> None:
+        for file_path in job.files:
+            file_path.unlink(missing_ok=True)
+
+    def _prune(self) -> None:
+        now = time.time()
+        for key, job in list(self._jobs.items()):
+            if self._expired(job, now):
+                del self._jobs[key]
+                self._remove_files(job)
+        for job in [job for job in self._replaced if self._expired(job, now)]:
+            self._replaced.remove(job)
+            self._remove_files(job)
+
+    def submit(self, run_folder: Path, report_data: dict, create_stories: bool) -> str:
+        """Submit a report job and return its key."""
+        key = self.key(run_folder, report_data, create_stories)
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(key)
+            if job is not None and not job.future.done():
+                return key
+            if job is not None:
+                # the report of the finished job may still be downloaded
+                self._replaced.append(job)
+            output_file = self.folder.joinpath(f'{key}-{uuid.uuid4().hex[:8]}.pdf')
+            progress_file = output_file.with_suffix('.progress.json')
+            cancel_file = output_file.with_suffix('.cancel')
+            self.folder.mkdir(parents=True, exist_ok=True)
+            future = self._executor.submit(
+                create_report, run_folder, output_file, report_data['prepared_by'],
+                report_data['project'], create_stories, progress_file, cancel_file,
+                self.section_workers, self.chunk_size, self.figure_workers
+            )
+            self._jobs[key] = ReportJob(key, run_folder, output_file, time.time(), future)
+        return key
+
+    def cancel(self, key: str) -> None:
+        """Cancel a job.
+
+        A queued job is removed from the queue or stops before it starts if a
+        worker process already took it. A running job stops at its next
+        progress step. The job is cancelled for all the sessions that share it.
+        """
+        job = self._jobs.get(key)
+        if job is None or job.future.done():
+            return
+        job.cancel_file.touch()
+        job.future.cancel()
+
+    def job(self, key: str) -> Optional[ReportJob]:
+        """Get a job by its key. Returns None if the job is not in the queue."""
+        return self._jobs.get(key)
+
+    def position(self, key: str) -> int:
+        """Get the position of a job in the queue.
+
+        Returns 0 if the job is running or done and 1 for the next job that
+        starts.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None or job.state != 'queued':
+                return 0
+            waiting = [_job for _job in self._jobs.values() if _job.state == 'queued']
+        waiting.sort(key=lambda _job: _job.submitted_at)
+        return waiting.index(job) + 1
+
+
+@st.cache_resource
+def report_queue() -> ReportQueue:
+    """The report queue of the app server."""
+    return ReportQueue()
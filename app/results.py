@@ -1,48 +1,206 @@
 """Functions to download and load results."""
 import json
+from functools import partial
 from pathlib import Path
-from typing import Tuple
+from typing import Tuple, Union
 import streamlit as st
 
 from honeybee.model import Model
 
-from download import download_files
+from download import (download_files, copy_local_files, local_run_folder,
+    resolve_local_path)
+from ingest import ingest_run, is_complete
+from run_cache import run_cache
+from vis_set import request_vis_set
+from hourly_matrix import HourlyMatrix
+from datacollections import read_datacollections
+from states_schedule import StatesSchedule, read_states_schedule
+from results_source import FolderResults, LEED_SUMMARY_ZIP, results_source
+
+
+def _file_signature(file_path: Path) -> Tuple[str, int, int]:
+    """Return a signature of a file that changes whenever the file is rewritten.
+
+    The signature is used as part of the cache keys so that a run folder that is
+    downloaded again invalidates the cached results of the old files.
+    """
+    stat = file_path.stat()
+    return (str(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _load_json(file_path: str, signature: tuple) -> dict:
+    """Load a JSON file. The signature is only used as a cache key."""
+    with open(file_path) as json_file:
+        return json.load(json_file)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _load_model(model_file: str, signature: tuple) -> Model:
+    """Load a Honeybee model. The signature is only used as a cache key.
+
+    The model is shared between all sessions. It must not be edited in place;
+    duplicate it before making any changes.
+    """
+    return Model.from_hbjson(model_file)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _load_states_schedule(schedule_file: str, signature: tuple) \
+        -> Union[HourlyMatrix, StatesSchedule]:
+    """Load a states schedule. The signature is only used as a cache key."""
+    return read_states_schedule(Path(schedule_file))
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _load_datacollections(
+        _results: FolderResults, results_key: str, datacollections_folder: str,
+        signature: tuple) -> HourlyMatrix:
+    """Load a folder of data collections. The results key and the signature
+    are only used as cache keys."""
+    return read_datacollections(_results, datacollections_folder)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _load_results_source(run_folder: str, signature: tuple) -> FolderResults:
+    """Load the results of a run folder. The signature is only used as a cache
+    key."""
+    return results_source(Path(run_folder))
+
+
+def load_json(file_path: Path) -> dict:
+    """Load a JSON file through the in-memory cache."""
+    return _load_json(str(file_path), _file_signature(file_path))
+
+
+def load_model(model_file: Path) -> Model:
+    """Load a Honeybee model through the shared in-memory cache."""
+    return _load_model(str(model_file), _file_signature(model_file))
+
+
+def load_states_schedule(schedule_file: Path) \
+        -> Union[HourlyMatrix, StatesSchedule]:
+    """Load a states schedule through the shared in-memory cache.
+
+    The schedules are memory-mapped from the binary states_schedule.npy file
+    when possible. The schedule of each aperture group is only read when it is
+    requested.
+    """
+    return _load_states_schedule(str(schedule_file), _file_signature(schedule_file))
+
+
+def load_datacollections(results: FolderResults, datacollections_folder: str) -> HourlyMatrix:
+    """Load a folder of data collections through the shared in-memory cache.
+
+    The data collections are memory-mapped from a float32 matrix with one row
+    for each sensor grid.
+    """
+    signature = _file_signature(results.path(f'{datacollections_folder}/grids_info.json'))
+    return _load_datacollections(results, repr(results), datacollections_folder, signature)
+
+
+def load_results_source(run_folder: Path) -> FolderResults:
+    """Load the leed-summary results of a run folder through the shared
+    in-memory cache.
+
+    The results of a run folder with a leed-summary.zip are read from the zip.
+    The index of the zip members is only built once.
+    """
+    zip_file = run_folder.joinpath(LEED_SUMMARY_ZIP)
+    signature = _file_signature(zip_file) if zip_file.is_file() else None
+    return _load_results_source(str(run_folder), signature)
 
 
-st.cache_data
 def load_from_folder(folder: Path) \
-    -> Tuple[Path, Path, dict, dict, dict, dict, Model]:
-    """Load results from folder."""
-    leed_summary = folder.joinpath('leed-summary')
-    with open(leed_summary.joinpath('summary.json')) as json_file:
-        summary = json.load(json_file)
-    with open(leed_summary.joinpath('summary_grid.json')) as json_file:
-        summary_grid = json.load(json_file)
-    with open(leed_summary.joinpath('states_schedule.json')) as json_file:
-        states_schedule = json.load(json_file)
-    with open(leed_summary.joinpath('states_schedule_err.json')) as json_file:
-        states_schedule_err = json.load(json_file)
+    -> Tuple[FolderResults, Path, dict, dict, Union[HourlyMatrix, StatesSchedule], dict, Model]:
+    """Load results from folder.
+
+    The files are only parsed the first time they are loaded. Subsequent calls
+    return the cached results as long as the files on disk are unchanged.
+    """
+    results = load_results_source(folder)
+    summary = load_json(results.path('summary.json'))
+    summary_grid = load_json(results.path('summary_grid.json'))
+    states_schedule = \
+        load_states_schedule(results.path('states_schedule.json'))
+    states_schedule_err = \
+        load_json(results.path('states_schedule_err.json'))
+
+    vtjks_file = folder.joinpath('vis_set.vtkjs')
+
+    hb_model = load_model(folder.joinpath('model.hbjson'))
+
+    return (results, vtjks_file, summary, summary_grid, states_schedule,
+            states_schedule_err, hb_model)
+
+
+def read_from_folder(folder: Path) \
+    -> Tuple[FolderResults, Path, dict, dict, Union[HourlyMatrix, StatesSchedule], dict, Model]:
+    """Read results from folder without the in-memory caches of the app.
+
+    It returns the same results as load_from_folder and does not depend on the
+    Streamlit runtime, e.g. to create reports in a worker process. The model is
+    not shared and can be edited in place.
+    """
+    results = results_source(folder)
+    summary = results.read_json('summary.json')
+    summary_grid = results.read_json('summary_grid.json')
+    states_schedule = read_states_schedule(results.path('states_schedule.json'))
+    states_schedule_err = results.read_json('states_schedule_err.json')
 
     vtjks_file = folder.joinpath('vis_set.vtkjs')
 
-    hb_model = Model.from_hbjson(folder.joinpath('model.hbjson'))
+    hb_model = Model.from_hbjson(str(folder.joinpath('model.hbjson')))
 
-    return (leed_summary, vtjks_file, summary, summary_grid, states_schedule,
+    return (results, vtjks_file, summary, summary_grid, states_schedule,
             states_schedule_err, hb_model)
 
 
 def load_results() -> tuple:
-    """Load results from a run folder. If the the run folder does not exist
-    the files will be downloaded to the run folder."""
-    if not st.session_state.run_folder.exists():
-        st.session_state.run_folder.mkdir(parents=True, exist_ok=True)
-        # download results to run folder
+    """Load results from a run folder. If the the run folder is missing or
+    incomplete the files will be downloaded to the run folder."""
+    run = st.session_state.run
+    run_folder = st.session_state.run_folder
+    cache = run_cache()
+    cache_hit = is_complete(run_folder)
+    cache.record(cache_hit)
+    if not cache_hit:
         with st.spinner('Downloading files...'):
-            download_files()
+            # the metadata of the run is only fetched once the run is known to
+            # have succeeded, by download_files
+            ingest_run(run_folder, partial(download_files, run))
+    cache.touch(run_folder)
+    if not cache_hit:
+        cache.evict()
+    request_vis_set(run_folder)
 
     # load results from run folder
-    leed_summary, vtjks_file, summary, summary_grid, states_schedule, \
-        states_schedule_err, hb_model = load_from_folder(st.session_state.run_folder)
+    results, vtjks_file, summary, summary_grid, states_schedule, \
+        states_schedule_err, hb_model = load_from_folder(run_folder)
 
-    return (leed_summary, vtjks_file, summary, summary_grid, states_schedule,
+    return (results, vtjks_file, summary, summary_grid, states_schedule,
             states_schedule_err, hb_model)
+
+
+def load_local_results() -> tuple:
+    """Load local results from a run folder. If the run folder is missing or
+    incomplete the local files will be copied to the run folder.
+
+    The local files must be in the local results root. See has_local_results.
+    """
+    results_path = resolve_local_path(st.session_state.local_results)
+    model_file = resolve_local_path(st.session_state.local_model)
+    run_folder = local_run_folder(st.session_state.data_folder, results_path, model_file)
+    st.session_state.run_folder = run_folder
+    cache = run_cache()
+    cache_hit = is_complete(run_folder)
+    cache.record(cache_hit)
+    if not cache_hit:
+        with st.spinner('Copying files...'):
+            ingest_run(run_folder, partial(copy_local_files, results_path, model_file))
+    cache.touch(run_folder)
+    if not cache_hit:
+        cache.evict()
+    request_vis_set(run_folder)
+
+    return load_from_folder(run_folder)
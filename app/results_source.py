@@ -0,0 +1,136 @@
+"""Read the files of a leed-summary output from a folder or a zip file."""
+import json
+import os
+import threading
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, Union
+
+import numpy as np
+
+
+LEED_SUMMARY_FOLDER = 'leed-summary'
+LEED_SUMMARY_ZIP = 'leed-summary.zip'
+
+
+class FolderResults:
+    """The files of an extracted leed-summary folder.
+
+    The files are identified by their path relative to the folder using
+    forward slashes, e.g. results/da/Room_1.da.
+
+    Args:
+        folder: The leed-summary folder.
+    """
+
+    def __init__(self, folder: Path):
+        self.folder = Path(folder)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.folder})'
+
+    def exists(self, name: str) -> bool:
+        """Check if a file exists."""
+        return self.folder.joinpath(name).is_file()
+
+    def open(self, name: str) -> BinaryIO:
+        """Open a file for reading in binary mode."""
+        return open(self.folder.joinpath(name), 'rb')
+
+    def read_json(self, name: str) -> Union[dict, list]:
+        """Read a JSON file."""
+        with self.open(name) as json_file:
+            return json.load(json_file)
+
+    def load_array(self, name: str) -> np.ndarray:
+        """Load the values of a text results file, e.g. a .da file."""
+        with self.open(name) as values_file:
+            return np.loadtxt(values_file, ndmin=1)
+
+    def path(self, name: str) -> Path:
+        """Get the path to a file on disk."""
+        return self.folder.joinpath(name)
+
+
+class ZipResults(FolderResults):
+    """The files of a leed-summary zip file.
+
+    The members are read from the zip using an index of the member names so
+    the zip is never extracted as a whole. Members that must be on disk, e.g.
+    for memory-mapping, are extracted to the folder when they are requested.
+    Files in the folder take precedence over the members of the zip. This is
+    also where the files derived from the results, like the binary matrices,
+    are written.
+
+    Args:
+        zip_file: The leed-summary zip file.
+        folder: The folder to extract the members to.
+    """
+
+    def __init__(self, zip_file: Path, folder: Path):
+        super().__init__(folder)
+        self.zip_file = Path(zip_file)
+        with zipfile.ZipFile(self.zip_file) as zip_folder:
+            self._members: Dict[str, zipfile.ZipInfo] = {
+                info.filename: info for info in zip_folder.infolist()
+                if not info.is_dir()
+            }
+        # a zip file object can not be shared between threads
+        self._local = threading.local()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.zip_file}, {self.folder})'
+
+    def _zip(self) -> zipfile.ZipFile:
+        zip_folder = getattr(self._local, 'zip_folder', None)
+        if zip_folder is None:
+            zip_folder = self._local.zip_folder = zipfile.ZipFile(self.zip_file)
+        return zip_folder
+
+    def exists(self, name: str) -> bool:
+        return name in self._members or super().exists(name)
+
+    def open(self, name: str) -> BinaryIO:
+        if super().exists(name) or name not in self._members:
+            return super().open(name)
+        return self._zip().open(self._members[name])
+
+    def _extract_member(self, name: str) -> Path:
+        # the zip is untrusted input. A member like ../../x or /etc/x must not
+        # be written outside of the folder
+        folder = self.folder.resolve()
+        target = folder.joinpath(name).resolve()
+        if Path(name).is_absolute() or not target.is_relative_to(folder):
+            raise ValueError(f'The zip member is outside of the results folder: {name}')
+        if target.is_file():
+            return target
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = target.with_name(f'{target.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        with self._zip().open(self._members[name]) as src, open(temp_file, 'wb') as dst:
+            while True:
+                chunk = src.read(1024 ** 2)
+                if not chunk:
+                    break
+                dst.write(chunk)
+        temp_file.replace(target)
+        return target
+
+    def path(self, name: str) -> Path:
+        """Get the path to a file on disk. The member is extracted if it is not
+        on disk yet."""
+        if name in self._members:
+            return self._extract_member(name)
+        return super().path(name)
+
+
+def results_source(run_folder: Path) -> FolderResults:
+    """Get the leed-summary results of a run folder.
+
+    The results are read from leed-summary.zip if the run folder has one and
+    from the leed-summary folder otherwise.
+    """
+    leed_summary_folder = run_folder.joinpath(LEED_SUMMARY_FOLDER)
+    zip_file = run_folder.joinpath(LEED_SUMMARY_ZIP)
+    if zip_file.is_file():
+        return ZipResults(zip_file, leed_summary_folder)
+    return FolderResults(leed_summary_folder)
@@ -0,0 +1,170 @@
+"""Disk quota of the downloaded run folders."""
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import List, NamedTuple
+
+import streamlit as st
+
+from ingest import MANIFEST_FILE, is_ingesting
+
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_DATA_FOLDER = Path(__file__).parent.joinpath('data')
+# the quota can be set in bytes with the RUN_CACHE_MAX_BYTES environment variable
+DEFAULT_MAX_BYTES = int(os.environ.get('RUN_CACHE_MAX_BYTES', 20 * 1024 ** 3))
+# run folders that were opened in the last 30 minutes are considered in use
+DEFAULT_IN_USE_SECONDS = 30 * 60
+ACCESS_FILE = '.last_access'
+
+
+class RunFolder(NamedTuple):
+    path: Path
+    size: int
+    last_access: float
+
+
+class CacheUsage(NamedTuple):
+    size: int
+    max_bytes: int
+    runs: int
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0
+
+
+def _folder_size(folder: Path) -> int:
+    size = 0
+    for file_path in folder.rglob('*'):
+        try:
+            if file_path.is_file():
+                size += file_path.stat().st_size
+        except OSError:
+            continue
+    return size
+
+
+class RunCache:
+    """Least recently used run folders are removed once the quota is exceeded.
+
+    Every folder in the data folder is a run folder, including the folders
+    that were downloaded before run folders had a manifest. Hidden folders,
+    like the staging folders of the downloads, are not managed by the run
+    cache. The last access of a run folder is the modification time of its
+    .last_access file, or of the folder if it was never accessed since.
+
+    Args:
+        folder: The data folder with the run folders.
+        max_bytes: The quota of the run folders in bytes.
+        in_use_seconds: Run folders that were accessed more recently than this
+            are not removed as a session may still use them.
+    """
+
+    def __init__(
+            self, folder: Path = DEFAULT_DATA_FOLDER, max_bytes: int = DEFAULT_MAX_BYTES,
+            in_use_seconds: float = DEFAULT_IN_USE_SECONDS):
+        self.folder = Path(folder)
+        self.max_bytes = max_bytes
+        self.in_use_seconds = in_use_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._scan = (0, [])
+
+    def record(self, hit: bool) -> None:
+        """Record if a run was found in the cache or had to be downloaded."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def touch(self, run_folder: Path) -> None:
+        """Update the last access of a run folder."""
+        try:
+            run_folder.joinpath(ACCESS_FILE).touch()
+        except OSError:
+            pass
+
+    def run_folders(self) -> List[RunFolder]:
+        """Get the run folders sorted from the least to the most recently used."""
+        if not self.folder.is_dir():
+            return []
+        folders = []
+        for folder in self.folder.iterdir():
+            if folder.name.startswith('.') or not folder.is_dir():
+                continue
+            access_file = folder.joinpath(ACCESS_FILE)
+            try:
+                last_access = access_file.stat().st_mtime
+            except OSError:
+                # a run folder without a manifest was downloaded before run
+                # folders had a manifest and is downloaded again when opened
+                manifest_file = folder.joinpath(MANIFEST_FILE)
+                try:
+                    last_access = (manifest_file if manifest_file.is_file() else folder).stat().st_mtime
+                except OSError:
+                    # removed by another process
+                    continue
+            folders.append(RunFolder(folder, _folder_size(folder), last_access))
+        folders = sorted(folders, key=lambda f: f.last_access)
+        self._scan = (time.time(), folders)
+        return folders
+
+    def usage(self, max_age: float = 60) -> CacheUsage:
+        """Get the disk usage and the hit counts of the cache.
+
+        Args:
+            max_age: The run folders are only scanned again if the last scan
+                is older than this number of seconds.
+        """
+        scan_time, folders = self._scan
+        if time.time() - scan_time > max_age:
+            folders = self.run_folders()
+        return CacheUsage(
+            sum(f.size for f in folders), self.max_bytes, len(folders),
+            self.hits, self.misses
+        )
+
+    def evict(self) -> List[Path]:
+        """Remove the least recently used run folders that are not in use until
+        the run folders fit in the quota.
+
+        Returns:
+            The removed run folders.
+        """
+        removed = []
+        with self._lock:
+            folders = self.run_folders()
+            total = sum(f.size for f in folders)
+            now = time.time()
+            for folder in folders:
+                if total <= self.max_bytes:
+                    break
+                if now - folder.last_access < self.in_use_seconds \
+                        or is_ingesting(folder.path):
+                    continue
+                shutil.rmtree(folder.path, ignore_errors=True)
+                total -= folder.size
+                removed.append(folder.path)
+        if removed:
+            self._scan = (0, [])
+            LOGGER.info(
+                'Removed %d run folders to fit the quota of %d bytes.',
+                len(removed), self.max_bytes
+            )
+        return removed
+
+
+@st.cache_resource
+def run_cache() -> RunCache:
+    """The run cache shared by all sessions."""
+    return RunCache()
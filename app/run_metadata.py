@@ -0,0 +1,112 @@
+"""Snapshot of the metadata of a run on Pollination."""
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import streamlit as st
+from pollination_io.interactors import Run
+
+from ingest import MANIFEST_FILE
+
+
+METADATA_FILE = 'run_metadata.json'
+# the metadata of a run that is not downloaded yet is fetched again after 5 minutes
+DEFAULT_TTL = 5 * 60
+
+
+def _run_row(dataframe, run_id: str):
+    """Get the row of a run from a runs dataframe. The first row is used if the
+    run is not in the dataframe."""
+    if run_id in dataframe.index:
+        return dataframe.loc[run_id]
+    _, row = next(dataframe.iterrows())
+    return row
+
+
+def fetch_run_metadata(run: Run) -> Dict[str, Any]:
+    """Fetch the metadata of a run from Pollination.
+
+    The runs dataframe of the job is only requested once. It has the inputs of
+    all the runs in the job so it is slow for jobs with many runs.
+    """
+    runs_dataframe = run.job.runs_dataframe
+    recipe = run.recipe
+    status = run.status
+    return {
+        'owner': run.owner,
+        'project': run.project,
+        'job_id': run.job_id,
+        'run_id': run.id,
+        'recipe': {
+            'owner': recipe.owner, 'name': recipe.name, 'tag': recipe.tag
+        },
+        'status': {
+            'status': status.status.value,
+            'started_at': str(status.started_at),
+            'finished_at': str(status.finished_at)
+        },
+        'input_artifacts': {
+            name: str(value) for name, value in
+            _run_row(runs_dataframe.input_artifacts, run.id).items()
+        },
+        'input_parameters': {
+            name: str(value) for name, value in
+            _run_row(runs_dataframe.input_parameters, run.id).items()
+        }
+    }
+
+
+def write_run_metadata(run_folder: Path, metadata: Dict[str, Any]) -> Path:
+    """Write the metadata of a run to the run folder."""
+    metadata_file = run_folder.joinpath(METADATA_FILE)
+    temp_file = metadata_file.with_suffix('.tmp')
+    with open(temp_file, 'w') as json_file:
+        json.dump(metadata, json_file, indent=2)
+    temp_file.replace(metadata_file)
+    return metadata_file
+
+
+def read_run_metadata(run_folder: Path) -> Optional[Dict[str, Any]]:
+    """Read the metadata of a run from the run folder. Returns None if the run
+    folder has no metadata, e.g. the sample run or local results."""
+    metadata_file = run_folder.joinpath(METADATA_FILE)
+    if not metadata_file.is_file():
+        return None
+    with open(metadata_file) as json_file:
+        return json.load(json_file)
+
+
+def session_cache(key: str, func: Callable[[], Any], ttl: float = DEFAULT_TTL) -> Any:
+    """Cache the result of an API call in the session state for ttl seconds.
+
+    The session state is used instead of st.cache_data because the results
+    depend on the credentials of the session.
+    """
+    cache = st.session_state.setdefault('api_cache', {})
+    now = time.monotonic()
+    if key in cache:
+        timestamp, value = cache[key]
+        if now - timestamp < ttl:
+            return value
+    value = func()
+    cache[key] = (now, value)
+    return value
+
+
+def run_metadata(run: Run, run_folder: Path = None) -> Dict[str, Any]:
+    """Get the metadata of a run.
+
+    The metadata is read from the run folder if the run is downloaded. A run
+    that was downloaded before the metadata was part of the download gets the
+    metadata written to its folder. Otherwise the metadata is fetched from
+    Pollination and cached in the session.
+    """
+    if run_folder is not None:
+        metadata = read_run_metadata(run_folder)
+        if metadata is not None:
+            return metadata
+    metadata = session_cache(f'run_metadata/{run.id}', lambda: fetch_run_metadata(run))
+    if run_folder is not None and run_folder.joinpath(MANIFEST_FILE).is_file():
+        write_run_metadata(run_folder, metadata)
+    return metadata
@@ -0,0 +1,213 @@
+"""Lazy access to the shading states schedule of each aperture group."""
+import json
+import mmap
+import re
+from collections.abc import Mapping
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from ladybug.datacollection import HourlyContinuousCollection
+
+from hourly_matrix import HourlyMatrix, write_hourly_matrix, is_up_to_date
+
+
+OFFSETS_FILE = 'states_schedule_offsets.json'
+MATRIX_FILE = 'states_schedule.npy'
+# number of decoded aperture group schedules that each StatesSchedule keeps
+SCHEDULE_CACHE_SIZE = 8
+
+# structural characters of a JSON document. Numbers are skipped by the regex
+# engine which keeps the scan fast for the long lists of hourly values
+_JSON_TOKENS = re.compile(rb'["\\{}\[\]]')
+
+
+def _scan_offsets(data) -> Dict[str, Tuple[int, int]]:
+    """Get the byte range of each value in a top-level JSON object.
+
+    The values of the top-level object are expected to be objects or lists,
+    which is the case for the data collection dictionaries of a states schedule.
+    """
+    offsets = {}
+    depth = 0
+    in_string = False
+    skip_until = -1
+    key_start = None
+    key = None
+    value_start = None
+    for match in _JSON_TOKENS.finditer(data):
+        pos = match.start()
+        if pos < skip_until:
+            # character escaped by a backslash
+            continue
+        char = data[pos:pos + 1]
+        if in_string:
+            if char == b'\\':
+                skip_until = pos + 2
+            elif char == b'"':
+                in_string = False
+                if depth == 1 and value_start is None:
+                    key = json.loads(data[key_start:pos + 1])
+        elif char == b'"':
+            in_string = True
+            if depth == 1 and value_start is None:
+                key_start = pos
+        elif char in (b'{', b'['):
+            if depth == 1:
+                value_start = pos
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 1:
+                offsets[key] = (value_start, pos + 1)
+                key = value_start = None
+
+    return offsets
+
+
+def build_offsets(schedule_file: Path) -> Dict[str, Tuple[int, int]]:
+    """Build the offset index of a states_schedule.json file.
+
+    The file is memory-mapped so it is never loaded in memory as a whole.
+    """
+    with open(schedule_file, 'rb') as inf:
+        if schedule_file.stat().st_size == 0:
+            return {}
+        with mmap.mmap(inf.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _scan_offsets(data)
+
+
+def write_offsets(schedule_file: Path) -> Path:
+    """Write the offset index of a states_schedule.json file next to it."""
+    stat = schedule_file.stat()
+    offsets_data = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'offsets': build_offsets(schedule_file)
+    }
+    offsets_file = schedule_file.parent.joinpath(OFFSETS_FILE)
+    with open(offsets_file, 'w') as outf:
+        json.dump(offsets_data, outf)
+    return offsets_file
+
+
+def _read_offsets(schedule_file: Path) -> Optional[Dict[str, Tuple[int, int]]]:
+    """Read the offset index if it is up to date with the schedule file.
+
+    Returns None if there is no index or it is out of date.
+    """
+    offsets_file = schedule_file.parent.joinpath(OFFSETS_FILE)
+    if not offsets_file.is_file():
+        return None
+    with open(offsets_file) as inf:
+        offsets_data = json.load(inf)
+    stat = schedule_file.stat()
+    if offsets_data['size'] != stat.st_size or \
+            offsets_data['mtime_ns'] != stat.st_mtime_ns:
+        return None
+    return offsets_data['offsets']
+
+
+class StatesSchedule(Mapping):
+    """Read-only mapping of aperture group identifiers to their schedules.
+
+    Only the byte offset of each aperture group is kept in memory. The schedule
+    of an aperture group is decoded from the file when it is requested. The
+    last decoded schedules are kept so the header and the values of a group
+    are only decoded once. The decoded schedules must not be edited.
+
+    Args:
+        schedule_file: Path to a states_schedule.json file.
+        offsets: A dictionary of aperture group identifiers and the byte range
+            of their schedule in the file.
+    """
+
+    def __init__(self, schedule_file: Path, offsets: Dict[str, Tuple[int, int]]):
+        self.schedule_file = schedule_file
+        self._offsets = offsets
+        self._read_schedule = lru_cache(maxsize=SCHEDULE_CACHE_SIZE)(self._read_schedule)
+
+    @classmethod
+    def from_file(cls, schedule_file: Path) -> 'StatesSchedule':
+        """Create a states schedule from a states_schedule.json file.
+
+        The offset index is read from disk if available. Otherwise it is built
+        and saved next to the file so it is only built once.
+        """
+        offsets = _read_offsets(schedule_file)
+        if offsets is None:
+            try:
+                write_offsets(schedule_file)
+                offsets = _read_offsets(schedule_file)
+            except OSError:
+                # read-only folder
+                offsets = build_offsets(schedule_file)
+        return cls(schedule_file, offsets)
+
+    def _read_schedule(self, aperture_group: str) -> dict:
+        start, end = self._offsets[aperture_group]
+        with open(self.schedule_file, 'rb') as inf:
+            inf.seek(start)
+            return json.loads(inf.read(end - start))
+
+    def __getitem__(self, aperture_group: str) -> dict:
+        return self._read_schedule(aperture_group)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, aperture_group: object) -> bool:
+        return aperture_group in self._offsets
+
+    def array(self, aperture_group: str) -> np.ndarray:
+        """Get the schedule values of an aperture group as an array."""
+        return np.array(self[aperture_group]['values'])
+
+    def header(self, aperture_group: str) -> dict:
+        """Get the header dictionary of the schedule of an aperture group."""
+        return self[aperture_group]['header']
+
+    def datacollection(self, aperture_group: str) -> HourlyContinuousCollection:
+        """Get the schedule of an aperture group as a data collection."""
+        return HourlyContinuousCollection.from_dict(self[aperture_group])
+
+
+def write_matrix(schedule_file: Path) -> Path:
+    """Convert a states_schedule.json file to a memory-mappable uint8 matrix.
+
+    The matrix has one row of 8760 shading states for each aperture group and
+    is written next to the JSON file together with a sidecar index of the
+    aperture group identifiers and their headers (incl. the metadata such as
+    'Shade Transmittance').
+    """
+    schedules = StatesSchedule.from_file(schedule_file)
+    rows = (
+        (aperture_group, schedule['header'], schedule['values'])
+        for aperture_group, schedule in schedules.items()
+    )
+    return write_hourly_matrix(
+        schedule_file.parent.joinpath(MATRIX_FILE), rows, len(schedules),
+        dtype='uint8', source=schedule_file
+    )
+
+
+def read_states_schedule(schedule_file: Path) \
+        -> Union[HourlyMatrix, StatesSchedule]:
+    """Read the states schedule from the most compact format available.
+
+    The uint8 matrix is used if it is up to date with the JSON file. Otherwise
+    it is created. If the states cannot be stored as uint8 or the folder is
+    read-only, the JSON file is read lazily using the offset index.
+    """
+    matrix_file = schedule_file.parent.joinpath(MATRIX_FILE)
+    if not is_up_to_date(matrix_file, schedule_file):
+        try:
+            write_matrix(schedule_file)
+        except (OSError, ValueError):
+            return StatesSchedule.from_file(schedule_file)
+    return HourlyMatrix.from_file(matrix_file)
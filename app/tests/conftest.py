@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# the modules of the app are imported by their name
+sys.path.insert(0, str(Path(__file__).parents[1]))
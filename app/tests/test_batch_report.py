@@ -0,0 +1,30 @@
+"""Tests of the command line tool to create the reports of many runs."""
+from pathlib import Path
+
+import pytest
+
+from batch_report import output_files
+
+
+def test_output_files(tmp_path):
+    run_folders = [tmp_path.joinpath('a', 'run'), tmp_path.joinpath('b', 'run'),
+                   tmp_path.joinpath('a', 'other')]
+    files = output_files(run_folders, tmp_path.joinpath('reports'))
+    assert len(set(files)) == 3
+    assert all(file_path.parent == tmp_path.joinpath('reports') for file_path in files)
+    assert files[0].name.startswith('run-') and files[1].name.startswith('run-')
+    assert files[2].name == 'other.pdf'
+    # the hash only depends on the parent folder of the run folder
+    assert output_files(run_folders[:2], tmp_path)[0].name == files[0].name
+
+
+def test_output_files_in_run_folders(tmp_path):
+    run_folders = [tmp_path.joinpath('a', 'run'), tmp_path.joinpath('b', 'run')]
+    assert output_files(run_folders) == [
+        run_folder.joinpath('report.pdf') for run_folder in run_folders]
+
+
+def test_output_files_duplicate_run_folder(tmp_path):
+    run_folder = tmp_path.joinpath('a', 'run')
+    with pytest.raises(ValueError):
+        output_files([run_folder, Path(f'{tmp_path}/a/../a/run')], tmp_path)
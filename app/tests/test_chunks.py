@@ -0,0 +1,95 @@
+"""Tests of the merge of the chunks of a report."""
+import re
+
+import pytest
+from pdfrw import PdfReader
+from reportlab import rl_config
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from pdf.chunks import TocEntry, merge_chunks
+
+
+@pytest.fixture(autouse=True)
+def uncompressed(monkeypatch):
+    # write the page numbers as plain text to read them back
+    monkeypatch.setattr(rl_config, 'pageCompression', 0)
+
+
+def _chunk(pdf_file, texts):
+    chunk_canvas = canvas.Canvas(str(pdf_file), pagesize=A4)
+    for text in texts:
+        chunk_canvas.drawString(100, 400, text)
+        chunk_canvas.showPage()
+    chunk_canvas.save()
+    return pdf_file
+
+
+def _streams(obj):
+    """Yield the decoded content streams of a page and its form xobjects."""
+    contents = obj.Contents
+    for stream in (contents if isinstance(contents, list) else [contents]):
+        if stream is not None:
+            yield stream.stream
+    for xobject in (obj.Resources.XObject or {}).values():
+        if xobject.Subtype == '/Form':
+            yield xobject.stream
+            yield from _streams(xobject)
+
+
+def _page_texts(pdf_file):
+    reader = PdfReader(str(pdf_file))
+    return [
+        re.findall(r'\((.*?)\) Tj', ''.join(_streams(page))) for page in reader.pages
+    ]
+
+
+@pytest.fixture
+def chunk_files(tmp_path):
+    return [
+        _chunk(tmp_path.joinpath('chunk-0.pdf'), ['cover', 'contents', 'summary']),
+        _chunk(tmp_path.joinpath('chunk-1.pdf'), ['room 1', 'room 2']),
+        _chunk(tmp_path.joinpath('chunk-2.pdf'), ['room 3'])
+    ]
+
+
+@pytest.mark.parametrize('start_on_skip_pages, numbers', [
+    (False, ['Page 3 of 6', 'Page 4 of 6', 'Page 5 of 6', 'Page 6 of 6']),
+    (True, ['Page 1 of 4', 'Page 2 of 4', 'Page 3 of 4', 'Page 4 of 4']),
+])
+def test_merge_chunks_page_numbers(chunk_files, tmp_path, start_on_skip_pages, numbers):
+    output_file = tmp_path.joinpath('report.pdf')
+    page_count = merge_chunks(
+        chunk_files, output_file, [], A4, skip_pages=2,
+        start_on_skip_pages=start_on_skip_pages)
+    assert page_count == 6
+    texts = _page_texts(output_file)
+    assert [page_texts[0] for page_texts in texts] == \
+        ['cover', 'contents', 'summary', 'room 1', 'room 2', 'room 3']
+    # the skip pages have no page number
+    assert texts[0] == ['cover'] and texts[1] == ['contents']
+    assert [page_texts[1:] for page_texts in texts[2:]] == [[number] for number in numbers]
+
+
+def test_merge_chunks_bookmarks(chunk_files, tmp_path):
+    output_file = tmp_path.joinpath('report.pdf')
+    entries = [
+        TocEntry(0, 'Summary', 1), TocEntry(0, 'Rooms', 2),
+        TocEntry(1, 'Room 1', 2), TocEntry(1, 'Room 3', 4)
+    ]
+    merge_chunks(chunk_files, output_file, entries, A4, skip_pages=2, title='Report')
+    reader = PdfReader(str(output_file))
+    assert reader.Info.Title.to_unicode() == 'Report'
+    pages = reader.pages
+
+    def _bookmarks(item):
+        while item is not None:
+            yield item.Title.to_unicode(), pages.index(item.Dest[0]), \
+                list(_bookmarks(item.First))
+            item = item.Next
+
+    # the pages of the entries are counted after the skip pages
+    assert list(_bookmarks(reader.Root.Outlines.First)) == [
+        ('Summary', 2, []),
+        ('Rooms', 3, [('Room 1', 3, []), ('Room 3', 5, [])])
+    ]
@@ -0,0 +1,44 @@
+"""Tests of the hourly data collections of the sensor grids."""
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import datacollections
+from datacollections import read_datacollections
+from results_source import FolderResults
+
+
+SAMPLE_FOLDER = Path(__file__).parents[1].joinpath('sample', 'leed-summary')
+FOLDER = 'datacollections/ase_percentage_above'
+
+
+@pytest.fixture
+def results(tmp_path):
+    folder = tmp_path.joinpath('leed-summary')
+    shutil.copytree(SAMPLE_FOLDER.joinpath(FOLDER), folder.joinpath(FOLDER))
+    return FolderResults(folder)
+
+
+def test_read_datacollections(results):
+    matrix = read_datacollections(results, FOLDER)
+    assert datacollections.matrix_file(results, FOLDER).is_file()
+    grid_id = results.read_json(f'{FOLDER}/grids_info.json')[0]['full_id']
+    values = results.read_json(f'{FOLDER}/{grid_id}.json')['values']
+    assert np.allclose(matrix.array(grid_id), values)
+
+
+def test_read_datacollections_read_only(results, monkeypatch):
+    def write_matrix(*args):
+        raise OSError('Read-only file system')
+
+    monkeypatch.setattr(datacollections, 'write_matrix', write_matrix)
+    matrix = read_datacollections(results, FOLDER)
+    assert not datacollections.matrix_file(results, FOLDER).exists()
+    grids_info = results.read_json(f'{FOLDER}/grids_info.json')
+    assert list(matrix) == [grid_info['full_id'] for grid_info in grids_info]
+    for grid_info in grids_info:
+        data_dict = results.read_json(f"{FOLDER}/{grid_info['full_id']}.json")
+        assert matrix.header(grid_info['full_id']) == data_dict['header']
+        assert np.allclose(matrix.array(grid_info['full_id']), data_dict['values'])
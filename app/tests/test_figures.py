@@ -0,0 +1,84 @@
+"""Tests of the heatmaps that are rendered before the report is built."""
+import os
+import pickle
+from io import BytesIO
+
+import numpy as np
+from pdfrw import PdfReader
+from reportlab.pdfgen import canvas
+
+from pdf.figure_cache import FigureCache
+from pdf.figures import Heatmap, heatmap_image, render_heatmaps
+
+
+def _heatmaps() -> dict:
+    schedule = np.zeros(8760)
+    schedule[np.arange(10, 8760, 24)] = 1
+    return {
+        ('grid', 'Room_1'): Heatmap('grid', 'Room_1', [12, 13, 14]),
+        ('aperture_group', 'Group_1'): Heatmap('aperture_group', 'Group_1', schedule, 0.2),
+        ('aperture_group', 'Group_2'): Heatmap('aperture_group', 'Group_2', np.zeros(8760)),
+    }
+
+
+def _page_content(image: bytes) -> str:
+    # the PDF files have a different creation date in each process
+    return PdfReader(BytesIO(image)).pages[0].Contents.stream
+
+
+def test_render_heatmaps_in_workers():
+    serial, serial_timings = render_heatmaps(_heatmaps(), 300, workers=1)
+    parallel, parallel_timings = render_heatmaps(_heatmaps(), 300, workers=2)
+    assert list(serial) == list(parallel) == list(_heatmaps())
+    for key, image in serial.items():
+        assert _page_content(image) == _page_content(parallel[key])
+    assert all(seconds > 0 for seconds in serial_timings.values())
+    assert list(parallel_timings) == list(serial_timings)
+
+
+def test_heatmap_image(tmp_path):
+    images, _ = render_heatmaps(_heatmaps(), 300, workers=1)
+    image = heatmap_image(images[('grid', 'Room_1')], 300)
+    assert image.wrap(500, 500) == (300, 150)
+    # the flowables of the section workers are pickled
+    image = pickle.loads(pickle.dumps(image))
+    pdf_canvas = canvas.Canvas(str(tmp_path.joinpath('image.pdf')))
+    image.drawOn(pdf_canvas, 0, 0)
+    pdf_canvas.save()
+    assert tmp_path.joinpath('image.pdf').stat().st_size > 0
+
+
+def test_render_heatmaps_from_cache(tmp_path):
+    cache = FigureCache(tmp_path)
+    heatmaps = _heatmaps()
+    # the same schedule of another room
+    heatmaps[('aperture_group', 'Group_1', 'Room_2')] = heatmaps[('aperture_group', 'Group_1')]
+    images, timings = render_heatmaps(heatmaps, 300, workers=1, cache=cache)
+    assert images[('aperture_group', 'Group_1', 'Room_2')] == images[('aperture_group', 'Group_1')]
+    assert timings[('aperture_group', 'Group_1', 'Room_2')] == 0
+    assert len(list(tmp_path.glob('*/*.pdf'))) == 3
+
+    cached_images, cached_timings = render_heatmaps(heatmaps, 300, workers=1, cache=cache)
+    assert cached_images == images
+    assert all(seconds == 0 for seconds in cached_timings.values())
+
+    # the title and the size are part of the key
+    renamed = {'renamed': _heatmaps()[('grid', 'Room_1')]._replace(title='Room_2')}
+    _, renamed_timings = render_heatmaps(renamed, 300, workers=1, cache=cache)
+    _, resized_timings = render_heatmaps(_heatmaps(), 200, workers=1, cache=cache)
+    assert renamed_timings['renamed'] > 0
+    assert all(seconds > 0 for seconds in resized_timings.values())
+
+
+def test_figure_cache_evict(tmp_path):
+    cache = FigureCache(tmp_path, max_bytes=250)
+    keys = [FigureCache.key(bytes([index]), 'title') for index in range(3)]
+    for index, key in enumerate(keys):
+        cache.put(key, bytes(100))
+        # the oldest figure is the least recently used
+        os.utime(cache._path(key), (index, index))
+    assert cache.get(keys[0]) == bytes(100)
+    cache.evict()
+    assert cache.size() == 200
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
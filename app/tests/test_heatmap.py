@@ -0,0 +1,55 @@
+"""Tests of the vectorized colors of the report heatmaps."""
+import numpy as np
+import pytest
+from ladybug.color import Colorset, ColorRange
+from plotly.colors import sample_colorscale
+
+from pdf.heatmap import colorscale_colors, values_to_colors
+
+
+VALUES = np.concatenate([
+    np.linspace(-20, 270, 2901),
+    # the domain boundaries and values right next to them
+    [0, 100, 250, 1e-9, 100 - 1e-9, 100 + 1e-9, 250 + 1e-9, -1e-9]
+])
+
+
+@pytest.mark.parametrize('color_range', [
+    ColorRange(colors=Colorset.annual_comfort(), domain=[0, 100]),
+    ColorRange(colors=Colorset.original(), domain=[0, 250]),
+    ColorRange(colors=Colorset.original(), domain=[0, 100, 250]),
+    ColorRange(colors=Colorset.original(), domain=[0, 250], continuous_colors=False),
+    ColorRange(colors=Colorset.annual_comfort(), domain=[0, 40, 100], continuous_colors=False),
+])
+def test_values_to_colors(color_range):
+    expected = [
+        (color.r, color.g, color.b) for color in map(color_range.color, VALUES)]
+    assert values_to_colors(VALUES, color_range).tolist() == [list(c) for c in expected]
+
+
+@pytest.mark.parametrize('colorscale', [
+    [(0, (255, 255, 255)), (1, (0, 0, 255))],
+    [(0, (0, 0, 128)), (0.25, (0, 255, 0)), (0.5, (255, 255, 0)), (1, (255, 0, 0))],
+])
+def test_colorscale_colors(colorscale):
+    zmin, zmax = 10, 50
+    values = np.linspace(zmin, zmax, 401)
+    plotly_colorscale = [
+        [position, tuple(c / 255 for c in color)] for position, color in colorscale]
+    expected = sample_colorscale(
+        plotly_colorscale, (values - zmin) / (zmax - zmin), colortype='tuple')
+    expected = np.array(expected) * 255
+    result = colorscale_colors(values, colorscale, zmin, zmax)
+    # the colors are rounded to the nearest integer
+    assert np.abs(result - expected).max() <= 0.5 + 1e-9
+    # values outside of the range get the first and the last color
+    outside = colorscale_colors([zmin - 5, zmax + 5], colorscale, zmin, zmax)
+    assert outside.tolist() == [list(colorscale[0][1]), list(colorscale[-1][1])]
+
+
+def test_colorscale_colors_step():
+    # a position that is repeated gives a hard step between two colors
+    colorscale = [(0, (0, 0, 0)), (0.5, (0, 0, 0)), (0.5, (255, 0, 0)), (1, (255, 0, 0))]
+    result = colorscale_colors([0, 0.49, 0.5, 0.51, 1], colorscale, 0, 1)
+    assert result.tolist() == [[0, 0, 0], [0, 0, 0], [255, 0, 0], [255, 0, 0], [255, 0, 0]]
+    assert colorscale_colors([3, 3], colorscale, 3, 3).tolist() == [[0, 0, 0], [0, 0, 0]]
@@ -0,0 +1,92 @@
+"""Tests of the atomic download of run folders."""
+import threading
+import time
+
+import pytest
+
+from ingest import RunLock, ingest_run, is_complete, is_ingesting
+
+
+def _download(folder):
+    folder.joinpath('results').mkdir()
+    folder.joinpath('results', 'summary.json').write_text('{}')
+    folder.joinpath('model.hbjson').write_text('{"type": "Model"}')
+
+
+def test_ingest_run(tmp_path):
+    run_folder = tmp_path.joinpath('run')
+    assert ingest_run(run_folder, _download)
+    assert is_complete(run_folder, checksums=True)
+    assert run_folder.joinpath('results', 'summary.json').read_text() == '{}'
+    # a complete run folder is not downloaded again
+    assert not ingest_run(run_folder, pytest.fail)
+    # no staging folders are left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['.run.lock', 'run']
+
+
+def test_ingest_run_interrupted(tmp_path):
+    run_folder = tmp_path.joinpath('run')
+
+    def download(folder):
+        folder.joinpath('model.hbjson').write_text('{}')
+        raise ConnectionError('The download failed.')
+
+    with pytest.raises(ConnectionError):
+        ingest_run(run_folder, download)
+    # an interrupted download never leaves a run folder
+    assert not run_folder.exists()
+    assert [p.name for p in tmp_path.iterdir()] == ['.run.lock']
+
+
+def test_ingest_run_incomplete(tmp_path):
+    run_folder = tmp_path.joinpath('run')
+    ingest_run(run_folder, _download)
+    run_folder.joinpath('model.hbjson').write_text('{}')
+    assert not is_complete(run_folder)
+    # an incomplete run folder is downloaded again
+    assert ingest_run(run_folder, _download)
+    assert is_complete(run_folder)
+    assert run_folder.joinpath('model.hbjson').read_text() == '{"type": "Model"}'
+
+
+def test_is_complete_checksums(tmp_path):
+    run_folder = tmp_path.joinpath('run')
+    ingest_run(run_folder, _download)
+    # a file with the same size but another content
+    run_folder.joinpath('model.hbjson').write_text('{"type": "Other"}')
+    assert is_complete(run_folder)
+    assert not is_complete(run_folder, checksums=True)
+
+
+def test_ingest_run_single_flight(tmp_path):
+    run_folder = tmp_path.joinpath('run')
+    downloads = []
+
+    def download(folder):
+        downloads.append(folder)
+        time.sleep(0.2)
+        _download(folder)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(ingest_run(run_folder, download)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # the other threads wait for the download of the first one
+    assert len(downloads) == 1
+    assert sorted(results) == [False, False, False, True]
+    assert is_complete(run_folder)
+
+
+def test_run_lock(tmp_path):
+    run_folder = tmp_path.joinpath('run')
+    lock = RunLock(run_folder)
+    assert not is_ingesting(run_folder)
+    with lock:
+        assert is_ingesting(run_folder)
+        assert not RunLock(run_folder).acquire(blocking=False)
+    assert not is_ingesting(run_folder)
@@ -0,0 +1,54 @@
+"""Tests of the level and room sections of the PDF report."""
+from pathlib import Path
+
+from reportlab import rl_config
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.platypus import KeepTogether
+
+import pdf_report
+from pdf_report import _build_story, _init_section_worker, collect_heatmaps, create_sections
+from pdf.figures import render_heatmaps
+from pdf.progress import ReportProgress
+
+
+SAMPLE_FOLDER = Path(__file__).parents[1].joinpath('sample')
+PAGE_LAYOUT = {
+    'pagesize': A4, 'left_margin': 1.5*cm, 'right_margin': 1.5*cm,
+    'top_margin': 2*cm, 'bottom_margin': 2*cm
+}
+
+
+def _build(output_file: Path, section_stories: list) -> bytes:
+    _build_story(output_file, [f for story in section_stories for f in story], PAGE_LAYOUT)
+    return output_file.read_bytes()
+
+
+def test_create_sections_in_workers(tmp_path, monkeypatch):
+    """The sections created in worker processes build the same PDF as the
+    sections created in the current process."""
+    # the PDF files have no creation date and no random document id
+    monkeypatch.setattr(rl_config, 'invariant', 1)
+    # like in a new process, no KeepTogether was created yet
+    monkeypatch.delattr(KeepTogether, 'FrameBreak', raising=False)
+    monkeypatch.delattr(KeepTogether, 'NullActionFlowable', raising=False)
+
+    _init_section_worker(SAMPLE_FOLDER, True, PAGE_LAYOUT, {})
+    context = pdf_report._worker_context
+    heatmaps = collect_heatmaps(
+        context.summary_grid, context.states_schedule, context.states_schedule_err,
+        context.model_index)
+    figures, _ = render_heatmaps(heatmaps, context.doc.width*0.60, workers=1)
+    context = context._replace(figures=figures)
+    initargs = (SAMPLE_FOLDER, True, PAGE_LAYOUT, figures)
+    story_id = next(iter(context.model_index.rooms_by_story))
+    grid_summary = next(iter(context.summary_grid.values()))
+    sections = [('level', story_id), ('room', grid_summary)]
+
+    parallel = create_sections(context, sections, ReportProgress(), 2, initargs)
+    parallel_pdf = _build(tmp_path.joinpath('parallel.pdf'), parallel)
+    serial = create_sections(context, sections, ReportProgress())
+    serial_pdf = _build(tmp_path.joinpath('serial.pdf'), serial)
+
+    assert len(parallel) == len(serial) == 2
+    assert parallel_pdf == serial_pdf
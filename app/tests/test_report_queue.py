@@ -0,0 +1,103 @@
+"""Tests of the queue of the reports of all sessions."""
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+from batch_report import ReportResult, create_report
+from report_queue import ReportQueue
+
+
+SAMPLE_FOLDER = Path(__file__).parents[1].joinpath('sample')
+REPORT_DATA = {'prepared_by': 'Tester', 'project': 'Sample Project'}
+
+
+class Executor:
+    """An executor that only runs the jobs when the test says so."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self.jobs.append((future, args))
+        return future
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = ReportQueue(workers=1, folder=tmp_path.joinpath('reports'))
+    queue._executor.shutdown()
+    queue._executor = Executor()
+    return queue
+
+
+def _finish(future: Future, args: tuple) -> None:
+    run_folder, output_file = args[:2]
+    if not future.running():
+        future.set_running_or_notify_cancel()
+    future.set_result(ReportResult(run_folder, output_file, 1))
+
+
+def test_submit_same_job(queue):
+    key = queue.submit(SAMPLE_FOLDER, REPORT_DATA, False)
+    assert queue.submit(SAMPLE_FOLDER, dict(REPORT_DATA), False) == key
+    assert len(queue._executor.jobs) == 1
+    assert queue.submit(SAMPLE_FOLDER, REPORT_DATA, True) != key
+    assert len(queue._executor.jobs) == 2
+
+
+def test_submit_finished_job(queue):
+    key = queue.submit(SAMPLE_FOLDER, REPORT_DATA, False)
+    job = queue.job(key)
+    _finish(*queue._executor.jobs[0])
+    assert queue.submit(SAMPLE_FOLDER, REPORT_DATA, False) == key
+    # the report of the finished job is not overwritten
+    assert len(queue._executor.jobs) == 2
+    assert queue.job(key).output_file != job.output_file
+    assert queue._replaced == [job]
+
+
+def test_position(queue):
+    first = queue.submit(SAMPLE_FOLDER, REPORT_DATA, False)
+    second = queue.submit(SAMPLE_FOLDER, REPORT_DATA, True)
+    # a worker process took the first job but did not start it yet
+    queue._executor.jobs[0][0].set_running_or_notify_cancel()
+    assert queue.job(first).state == 'queued'
+    assert (queue.position(first), queue.position(second)) == (1, 2)
+    # the worker writes the progress file once it starts the job
+    queue.job(first).progress_file.write_text('{}')
+    assert queue.job(first).state == 'running'
+    assert (queue.position(first), queue.position(second)) == (0, 1)
+    _finish(*queue._executor.jobs[0])
+    assert queue.job(first).state == 'done'
+
+
+def test_cancel_queued_job(queue):
+    key = queue.submit(SAMPLE_FOLDER, REPORT_DATA, False)
+    queue.cancel(key)
+    result = queue.job(key).result
+    assert result.cancelled
+
+
+def test_cancel_job_taken_by_worker(queue):
+    key = queue.submit(SAMPLE_FOLDER, REPORT_DATA, False)
+    future, args = queue._executor.jobs[0]
+    future.set_running_or_notify_cancel()
+    queue.cancel(key)
+    job = queue.job(key)
+    assert job.cancel_file.exists()
+    # the worker stops before it builds the report
+    result = create_report(*args)
+    assert result.cancelled
+    assert not job.output_file.exists()
+    assert not job.progress_file.exists()
+
+
+def test_remove_files(queue):
+    key = queue.submit(SAMPLE_FOLDER, REPORT_DATA, False)
+    job = queue.job(key)
+    for file_path in job.files:
+        file_path.write_text('')
+    queue._remove_files(job)
+    assert list(queue.folder.iterdir()) == []
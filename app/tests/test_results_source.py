@@ -0,0 +1,42 @@
+"""Tests of the leed-summary results read from a zip file."""
+import zipfile
+
+import pytest
+
+from results_source import ZipResults
+
+
+@pytest.fixture
+def zip_file(tmp_path):
+    zip_file = tmp_path.joinpath('leed-summary.zip')
+    with zipfile.ZipFile(zip_file, 'w') as zip_folder:
+        zip_folder.writestr('summary.json', '{"da": 1}')
+        zip_folder.writestr('results/da/Room_1.da', '1\n2\n3\n')
+        zip_folder.writestr('../../outside.txt', 'outside')
+        zip_folder.writestr('/absolute.txt', 'absolute')
+    return zip_file
+
+
+def test_read_members(zip_file, tmp_path):
+    results = ZipResults(zip_file, tmp_path.joinpath('leed-summary'))
+    assert results.read_json('summary.json') == {'da': 1}
+    assert results.load_array('results/da/Room_1.da').tolist() == [1, 2, 3]
+    # the members are not extracted to be read
+    assert not results.folder.exists()
+
+
+def test_extract_member(zip_file, tmp_path):
+    results = ZipResults(zip_file, tmp_path.joinpath('leed-summary'))
+    path = results.path('results/da/Room_1.da')
+    assert path == results.folder.joinpath('results/da/Room_1.da')
+    assert path.read_text() == '1\n2\n3\n'
+
+
+@pytest.mark.parametrize('name', ['../../outside.txt', '/absolute.txt'])
+def test_extract_member_outside_of_folder(zip_file, tmp_path, name):
+    folder = tmp_path.joinpath('extract', 'leed-summary')
+    results = ZipResults(zip_file, folder)
+    with pytest.raises(ValueError):
+        results.path(name)
+    assert not tmp_path.joinpath('outside.txt').exists()
+    assert [p for p in tmp_path.rglob('*.txt')] == []
@@ -0,0 +1,76 @@
+"""Tests of the disk quota of the downloaded run folders."""
+import os
+import time
+
+from ingest import RunLock
+from run_cache import ACCESS_FILE, RunCache
+
+
+def _run_folder(data_folder, name, size, last_access):
+    folder = data_folder.joinpath(name)
+    folder.mkdir(parents=True)
+    folder.joinpath('results.bin').write_bytes(b'0' * size)
+    access_file = folder.joinpath(ACCESS_FILE)
+    access_file.touch()
+    os.utime(access_file, (last_access, last_access))
+    return folder
+
+
+def test_run_folders(tmp_path):
+    now = time.time()
+    new = _run_folder(tmp_path, 'new', 10, now - 10)
+    old = _run_folder(tmp_path, 'old', 20, now - 100)
+    # hidden folders, e.g. the staging folders, are not run folders
+    tmp_path.joinpath('.run-staging-1').mkdir()
+    cache = RunCache(tmp_path, max_bytes=100)
+    folders = cache.run_folders()
+    assert [f.path for f in folders] == [old, new]
+    assert [f.size for f in folders] == [20, 10]
+    usage = cache.usage()
+    assert (usage.size, usage.runs) == (30, 2)
+
+
+def test_evict(tmp_path):
+    now = time.time()
+    oldest = _run_folder(tmp_path, 'oldest', 40, now - 3000)
+    old = _run_folder(tmp_path, 'old', 40, now - 2000)
+    new = _run_folder(tmp_path, 'new', 40, now - 1000)
+    cache = RunCache(tmp_path, max_bytes=90, in_use_seconds=60)
+    # the least recently used run folders are removed until the quota is met
+    assert cache.evict() == [oldest]
+    assert not oldest.exists() and old.exists() and new.exists()
+    assert cache.usage().size == 80
+    assert cache.evict() == []
+
+
+def test_evict_touched(tmp_path):
+    now = time.time()
+    first = _run_folder(tmp_path, 'first', 40, now - 3000)
+    second = _run_folder(tmp_path, 'second', 40, now - 2000)
+    cache = RunCache(tmp_path, max_bytes=50, in_use_seconds=60)
+    cache.touch(first)
+    # the run folder that was opened recently is in use
+    assert cache.evict() == [second]
+    assert first.exists()
+
+
+def test_evict_in_use(tmp_path):
+    now = time.time()
+    in_use = _run_folder(tmp_path, 'in-use', 40, now - 10)
+    ingesting = _run_folder(tmp_path, 'ingesting', 40, now - 3000)
+    cache = RunCache(tmp_path, max_bytes=10, in_use_seconds=60)
+    with RunLock(ingesting):
+        assert cache.evict() == []
+    assert in_use.exists() and ingesting.exists()
+    assert cache.evict() == [ingesting]
+
+
+def test_hit_rate(tmp_path):
+    cache = RunCache(tmp_path)
+    assert cache.usage().hit_rate == 0
+    cache.record(True)
+    cache.record(True)
+    cache.record(False)
+    usage = cache.usage()
+    assert (usage.hits, usage.misses) == (2, 1)
+    assert usage.hit_rate == 2 / 3
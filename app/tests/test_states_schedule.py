@@ -0,0 +1,38 @@
+"""Tests of the lazy access to the states schedule."""
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from states_schedule import StatesSchedule
+
+
+SAMPLE_FILE = Path(__file__).parents[1].joinpath(
+    'sample', 'leed-summary', 'states_schedule.json')
+
+
+@pytest.fixture
+def schedule_file(tmp_path):
+    return Path(shutil.copy(SAMPLE_FILE, tmp_path))
+
+
+def test_states_schedule(schedule_file):
+    states_schedule = StatesSchedule.from_file(schedule_file)
+    data = json.loads(schedule_file.read_text())
+    assert list(states_schedule) == list(data)
+    for aperture_group, schedule in data.items():
+        assert aperture_group in states_schedule
+        assert states_schedule.header(aperture_group) == schedule['header']
+        assert np.array_equal(states_schedule.array(aperture_group), schedule['values'])
+    assert 'missing' not in states_schedule
+
+
+def test_states_schedule_decoded_once(schedule_file):
+    states_schedule = StatesSchedule.from_file(schedule_file)
+    for aperture_group in states_schedule:
+        states_schedule.header(aperture_group)
+        states_schedule.array(aperture_group)
+    cache_info = states_schedule._read_schedule.cache_info()
+    assert cache_info.misses == len(states_schedule)
@@ -0,0 +1,40 @@
+"""Tests of the location of the weather files."""
+import pytest
+from ladybug.epw import EPW
+from ladybug.location import Location
+from ladybug.wea import Wea
+
+from weather import read_location
+
+
+LOCATION = Location('Boston Logan', 'MA', 'USA', 42.37, -71.02, -5, 6)
+
+
+def test_read_location_epw(tmp_path):
+    epw = EPW.from_missing_values()
+    epw.location = LOCATION
+    epw_file = tmp_path.joinpath('weather.epw')
+    epw.save(str(epw_file))
+    assert read_location(epw_file) == {
+        'city': 'Boston Logan', 'latitude': 42.37, 'longitude': -71.02
+    }
+
+
+def test_read_location_wea(tmp_path):
+    wea = Wea.from_annual_values(LOCATION, [0] * 8760, [0] * 8760)
+    wea_file = wea.write(str(tmp_path.joinpath('weather.wea')))
+    location = Wea.from_file(wea_file).location
+    # the longitude of a wea file is positive to the west
+    assert '71.02' in open(wea_file).read().split('\n')[2]
+    assert read_location(wea_file) == {
+        'city': location.city, 'latitude': location.latitude,
+        'longitude': location.longitude
+    }
+    assert read_location(wea_file)['longitude'] == -71.02
+
+
+def test_read_location_invalid(tmp_path):
+    weather_file = tmp_path.joinpath('weather.wea')
+    weather_file.write_text('not a weather file\n')
+    with pytest.raises(ValueError):
+        read_location(weather_file)
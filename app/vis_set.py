@@ -0,0 +1,178 @@
+"""Create the VTK visualization set of a run folder in the background."""
+import hashlib
+import logging
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Tuple
+
+import streamlit as st
+from pollination_streamlit_viewer import viewer
+from honeybee.model import Model
+from honeybee_display.model import model_to_vis_set, model_to_vis_set_wireframe
+from ladybug_geometry.geometry3d import Point3D
+from ladybug_display.visualization import (AnalysisGeometry, VisualizationData,
+    VisualizationMetaData)
+from ladybug_vtk.visualization_set import VisualizationSet as VTKVisualizationSet
+
+from results_source import FolderResults, results_source
+from vis_metadata import _leed_daylight_option_one_vis_metadata
+
+
+LOGGER = logging.getLogger(__name__)
+
+VIS_SET_FILE = 'vis_set.vtkjs'
+# the file extension of the results of each metric in the results folder
+RESULT_EXTENSIONS = {'da': 'da', 'ase_hours_above': 'res'}
+
+
+def _grid_data(hb_model: Model, results: FolderResults) -> AnalysisGeometry:
+    """Create the analysis geometry of the sensor grid results.
+
+    This is the grid data of model_to_vis_set but the values are read through
+    the results of the run folder, so the results in a zip file are read
+    without extracting them. The first data set, da, is active.
+    """
+    grids = {g.full_identifier: g for g in hb_model.properties.radiance.sensor_grids}
+    grid_list = results.read_json('results/da/grids_info.json')
+    data_sets = []
+    for metric, metric_info in _leed_daylight_option_one_vis_metadata().items():
+        extension = RESULT_EXTENSIONS[metric]
+        values = []
+        for grid in grid_list:
+            start_line = grid.get('start_ln', 0)
+            grid_values = results.load_array(
+                f'results/{metric}/{grid["full_id"]}.{extension}')
+            values.extend(grid_values[start_line:start_line + grid['count']].tolist())
+        metadata = VisualizationMetaData.from_dict(metric_info)
+        data_sets.append(VisualizationData(
+            values, metadata.legend_parameters, metadata.data_type, metadata.unit))
+
+    grid_objs = [grids[g['full_id']] for g in grid_list]
+    grid_meshes = [g.mesh for g in grid_objs]
+    if all(m is not None for m in grid_meshes):
+        a_geo = AnalysisGeometry('Grid_Data', grid_meshes, data_sets)
+    else:
+        points = [Point3D(*pos) for g in grid_objs for pos in g.positions]
+        a_geo = AnalysisGeometry('Grid_Data', points, data_sets)
+    a_geo.display_name = 'Grid Data'
+    a_geo.display_mode = 'Surface'
+    a_geo.active_data = 0
+    return a_geo
+
+
+def write_vis_set(run_folder: Path, hb_model: Model = None) -> Path:
+    """Write the vis_set.vtkjs file of a run folder.
+
+    The file is written to a temporary folder first and then moved in place so
+    a partially written file is never read.
+
+    Args:
+        run_folder: A run folder with a model.hbjson file and the leed-summary
+            results. The results in a zip file are not extracted.
+        hb_model: The model of the run. If None, the model is read from the
+            model.hbjson file.
+    """
+    start = time.perf_counter()
+    if hb_model is None:
+        hb_model = Model.from_hbjson(str(run_folder.joinpath('model.hbjson')))
+    vis_set = model_to_vis_set(
+        hb_model, color_by=None, grid_display_mode='None', include_wireframe=False
+    )
+    vis_set.add_geometry(_grid_data(hb_model, results_source(run_folder)))
+    vis_set.add_geometry(model_to_vis_set_wireframe(hb_model)[0])
+    vtk_vs = VTKVisualizationSet.from_visualization_set(vis_set)
+    vis_set_file = run_folder.joinpath(VIS_SET_FILE)
+    temp_folder = Path(tempfile.mkdtemp(dir=run_folder, prefix='.vis_set-'))
+    try:
+        temp_file = vtk_vs.to_vtkjs(folder=str(temp_folder), name='vis_set')
+        Path(temp_file).replace(vis_set_file)
+    finally:
+        shutil.rmtree(temp_folder, ignore_errors=True)
+    LOGGER.info('Created %s in %.2f s.', vis_set_file, time.perf_counter() - start)
+    return vis_set_file
+
+
+class VisSetTasks:
+    """Registry of the visualization sets that are being created.
+
+    There is one task for each run folder. The tasks run one at a time in a
+    background thread so they do not compete with the sessions for the CPU.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='vis-set')
+        self._tasks: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, run_folder: Path, hb_model: Model = None) -> Future:
+        """Start creating the visualization set of a run folder.
+
+        The running task is returned if the run folder already has one. A
+        finished task is started again, e.g. if it failed or the file was
+        removed after it was created.
+        """
+        key = str(run_folder.resolve())
+        with self._lock:
+            task = self._tasks.get(key)
+            if task is None or task.done():
+                task = self._executor.submit(write_vis_set, run_folder, hb_model)
+                self._tasks[key] = task
+            return task
+
+    def get(self, run_folder: Path) -> Future:
+        """Get the task of a run folder. Returns None if there is no task."""
+        with self._lock:
+            return self._tasks.get(str(run_folder.resolve()))
+
+
+@st.cache_resource
+def vis_set_tasks() -> VisSetTasks:
+    """The visualization set tasks shared by all sessions."""
+    return VisSetTasks()
+
+
+def request_vis_set(run_folder: Path, hb_model: Model = None) -> Future:
+    """Make sure the vis_set.vtkjs of a run folder exists or is being created.
+
+    Returns None if the file already exists.
+    """
+    if run_folder.joinpath(VIS_SET_FILE).is_file():
+        return None
+    return vis_set_tasks().submit(run_folder, hb_model)
+
+
+@st.cache_resource(max_entries=2)
+def _read_vis_set(vis_set_file: str, signature: tuple) -> Tuple[bytes, str]:
+    content = Path(vis_set_file).read_bytes()
+    return content, hashlib.sha256(content).hexdigest()
+
+
+def start_vis_set_run() -> None:
+    """Forget the vis sets that were sent before the previous run.
+
+    Call it at the start of each run. A viewer that is not shown in a run is
+    removed from the page, so it must get its vis set again the next time it
+    is shown.
+    """
+    st.session_state.vis_set_shown = st.session_state.pop('vis_set_sent', {})
+
+
+def show_vis_set(vis_set_file: Path, key: str = 'viz') -> None:
+    """Show a vis_set.vtkjs file in the viewer.
+
+    The file content is read once per process for each version of the file
+    and shared by all sessions instead of being read on every rerun. It is
+    only sent to the browser if the viewer did not get the same content in
+    the previous run. The viewer keeps its scene when it gets no content.
+    """
+    stat = vis_set_file.stat()
+    signature = (str(vis_set_file.resolve()), stat.st_mtime_ns, stat.st_size)
+    content, digest = _read_vis_set(signature[0], signature)
+    if st.session_state.get('vis_set_shown', {}).get(key) == digest:
+        content = None
+    st.session_state.setdefault('vis_set_sent', {})[key] = digest
+    viewer(content=content, key=key)
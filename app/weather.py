@@ -0,0 +1,66 @@
+"""Read the location of a weather file."""
+import json
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+
+LOCATION_FILE = 'weather_location.json'
+
+
+def read_location(weather_file: Path) -> Dict[str, Union[str, float]]:
+    """Read the location of a WEA or an EPW file.
+
+    Only the header of the file is read. This is much faster than loading the
+    file with ladybug which parses all the hourly values.
+
+    Returns:
+        A dictionary with the city, latitude and longitude of the location. The
+        longitude is positive to the east like the longitude of a ladybug
+        Location.
+    """
+    with open(weather_file, encoding='utf-8', errors='replace') as inf:
+        first_line = inf.readline().strip()
+        if first_line.startswith('LOCATION'):
+            # LOCATION,city,state,country,source,station id,latitude,longitude,...
+            fields = first_line.split(',')
+            return {
+                'city': fields[1],
+                'latitude': float(fields[6]),
+                'longitude': float(fields[7])
+            }
+        # the header of a wea file has 6 lines
+        header = {}
+        line = first_line
+        for _ in range(6):
+            key, _, value = line.partition(' ')
+            header[key] = value.strip()
+            line = inf.readline().strip()
+    try:
+        # the longitude of a wea file is positive to the west
+        return {
+            'city': header['place'],
+            'latitude': float(header['latitude']),
+            'longitude': -float(header['longitude'])
+        }
+    except (KeyError, ValueError):
+        raise ValueError(f'Failed to read the location of {weather_file}.')
+
+
+def write_location_file(run_folder: Path, location: Dict[str, Union[str, float]]) -> Path:
+    """Write the location of the weather file of a run to the run folder."""
+    location_file = run_folder.joinpath(LOCATION_FILE)
+    temp_file = location_file.with_suffix('.tmp')
+    with open(temp_file, 'w') as json_file:
+        json.dump(location, json_file, indent=2)
+    temp_file.replace(location_file)
+    return location_file
+
+
+def read_location_file(run_folder: Path) -> Optional[Dict[str, Union[str, float]]]:
+    """Read the location of the weather file of a run from the run folder.
+    Returns None if the run folder has no location file."""
+    location_file = run_folder.joinpath(LOCATION_FILE)
+    if not location_file.is_file():
+        return None
+    with open(location_file) as json_file:
+        return json.load(json_file)